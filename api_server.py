@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import io
-import tempfile
-import json
 from pathlib import Path
 import asyncio
+import os
+import shutil
 import sys
+import tempfile
+import time
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from parse_input_text import parse_text
-from generate_resume import render_html, html_to_pdf
+from cdp_session import close_cdp_sessions
+from generate_resume import RENDERERS, PdfRenderError, render_html, html_to_pdf_bytes_async, precompile_templates, probe_renderers_async
+from incremental_preview import PreviewSessions
+from lazy_imports import import_report
+from pdf_compose import LETTER_TEMPLATE, ORDERS, has_letter, letter_data, letter_key, merge_pdfs, resume_data, resume_key
+import metrics
+from playwright_pool import async_renderer_health, shutdown_async_renderer
+from render_cache import RenderCache, cache_key
+from render_jobs import JobManager, JobsFull, SharedJobStore
+from render_queue import ClientGone, QueueFull, QueueRejected, RenderQueue
+from template_fanout import build_zip, output_name
+from template_gallery import TemplateGallery, thumbnails_enabled
 
 if sys.platform.startswith('win'):
     try:
@@ -27,6 +39,23 @@ UI_INDEX = BASE_DIR / 'ui' / 'index.html'
 UI_DIR = BASE_DIR / 'ui'
 
 ALLOWED_TEMPLATES = {p.name for p in TEMPLATES_DIR.glob('*.html')}
+RENDER_CACHE = RenderCache()
+RENDER_QUEUE = RenderQueue()
+RENDER_JOBS = JobManager(
+    render=lambda html: html_to_pdf_bytes_async(html, base_url=str(TEMPLATES_DIR)),
+    on_done=lambda job: RENDER_CACHE.put(job.cache_key, job.pdf),
+    # with several workers a job may be polled on a worker that did not run it
+    store=SharedJobStore(RENDER_CACHE.shared.path) if RENDER_CACHE.shared else None,
+)
+# Preview sessions stay per worker: a session id that reaches another worker
+# starts a new session (with a new id) there, which costs one full parse,
+# not wrong output.
+PREVIEW_SESSIONS = PreviewSessions()
+# gallery PDFs share the async renderer and admission control with requests
+GALLERY = TemplateGallery(
+    TEMPLATES_DIR, BASE_DIR / 'sample_input.json',
+    render=lambda html: RENDER_QUEUE.submit(lambda: html_to_pdf_bytes_async(html, base_url=str(TEMPLATES_DIR))),
+)
 
 
 def _safe_template_name(template_name: str) -> str:
@@ -39,6 +68,126 @@ def _safe_template_name(template_name: str) -> str:
         return 'resume_minimal.html'
     return name
 
+# Startup warm-up runs in the background so the server answers preview
+# requests straight away; /api/ready turns 200 once it has finished.
+WARM_UP = {'ready': False, 'started_at': None, 'finished_at': None, 'steps': {}}
+_WARM_UP_TASK = None
+_THUMBNAILS_TASK = None
+
+
+async def _warm_step(name, fn, *args):
+    start = time.perf_counter()
+    try:
+        result = await fn(*args) if asyncio.iscoroutinefunction(fn) else await asyncio.to_thread(fn, *args)
+        WARM_UP['steps'][name] = {'ms': round((time.perf_counter() - start) * 1000, 1), 'result': result}
+    except Exception as e:
+        WARM_UP['steps'][name] = {'ms': round((time.perf_counter() - start) * 1000, 1), 'error': str(e)}
+        print(f'Warm-up step {name} failed: {e}')
+
+
+async def _warm_up():
+    templates = sorted(ALLOWED_TEMPLATES)
+    await _warm_step('templates', precompile_templates, str(TEMPLATES_DIR))
+    await _warm_step('gallery', GALLERY.warm, templates)
+    if os.environ.get('RESUME_PROBE_RENDERERS', '1').strip().lower() not in ('0', 'false', 'no', 'off'):
+        # imports the PDF libraries and renders a blank page with each
+        # backend, which also starts the browser and loads fonts
+        await _warm_step('renderers', probe_renderers_async)
+    if thumbnails_enabled() and 'error' not in WARM_UP['steps']['gallery']:
+        # PDF renders take seconds each; don't hold up readiness for them
+        global _THUMBNAILS_TASK
+        _THUMBNAILS_TASK = asyncio.create_task(GALLERY.warm_thumbnails(templates))
+    WARM_UP['ready'] = True
+    WARM_UP['finished_at'] = time.time()
+
+
+WORKER = {'pid': os.getpid(), 'tmp': None}
+
+
+@app.on_event('startup')
+def _isolate_worker_tmp():
+    # Set by serve.py: each worker process keeps browser profiles and other
+    # scratch files in its own directory, removed again on shutdown.
+    if os.environ.get('RESUME_WORKER_TMP') != '1':
+        return
+    WORKER['pid'] = os.getpid()
+    WORKER['tmp'] = tempfile.mkdtemp(prefix=f'resume-worker-{os.getpid()}-')
+    tempfile.tempdir = WORKER['tmp']
+
+
+@app.on_event('startup')
+async def _start_warm_up():
+    global _WARM_UP_TASK
+    WARM_UP['started_at'] = time.time()
+    _WARM_UP_TASK = asyncio.create_task(_warm_up())
+
+
+@app.on_event('shutdown')
+async def _close_renderers():
+    for task in (_WARM_UP_TASK, _THUMBNAILS_TASK):
+        if task is not None:
+            task.cancel()
+    await RENDER_JOBS.stop()
+    await shutdown_async_renderer()
+    await asyncio.to_thread(close_cdp_sessions)
+    if WORKER['tmp']:
+        tempfile.tempdir = None
+        shutil.rmtree(WORKER['tmp'], ignore_errors=True)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def _render_failed(e: Exception, what: str = 'PDF') -> HTTPException:
+    # PdfRenderError already says which backends failed and why, on one line
+    reason = e.reason if isinstance(e, PdfRenderError) else str(e)
+    return HTTPException(status_code=500, detail=f'Failed to render {what}: {reason}')
+
+
+async def _client_gone(request: Request) -> None:
+    # The body has already been read, so the next ASGI message can only be
+    # the disconnect notification.
+    while True:
+        message = await request.receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+def _cached_html(data: dict, template_name: str, key: str | None = None) -> str:
+    key = key or cache_key('html', data, TEMPLATES_DIR, template_name)
+    cached = RENDER_CACHE.get(key, shared=False)
+    if cached is not None:
+        return cached.decode('utf-8')
+    html = render_html(data, str(TEMPLATES_DIR), template_name=template_name)
+    RENDER_CACHE.put(key, html.encode('utf-8'), shared=False)
+    return html
+
+
+QUEUE_GAUGE = metrics.Gauge('resume_render_queue', 'Render admission queue state', ('state',))
+CACHE_GAUGE = metrics.Gauge('resume_render_cache', 'Render cache counters and size', ('field',))
+JOBS_GAUGE = metrics.Gauge('resume_jobs', 'Background render jobs by status', ('status',))
+
+
+@app.middleware('http')
+async def _instrument(request: Request, call_next):
+    timings, token = metrics.begin_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.end_request(timings, token)
+    elapsed = time.perf_counter() - start
+    route = getattr(request.scope.get('route'), 'path', 'unmatched')
+    metrics.HTTP_SECONDS.observe(elapsed, route=route, method=request.method, status=response.status_code)
+    response.headers['Server-Timing'] = timings.header(total=elapsed)
+    return response
+
+
 app.mount('/ui', StaticFiles(directory=str(UI_DIR), html=True), name='ui')
 
 
@@ -47,6 +196,33 @@ def index():
     return UI_INDEX.read_text(encoding='utf-8')
 
 
+@app.get('/api/health')
+def health():
+    return JSONResponse({'status': 'ok', 'worker': WORKER, 'renderer': async_renderer_health(), 'pdf_renderers': RENDERERS.stats(), 'render_cache': RENDER_CACHE.stats(), 'render_queue': RENDER_QUEUE.stats(), 'jobs': RENDER_JOBS.stats()})
+
+
+@app.get('/api/ready')
+def ready():
+    body = dict(WARM_UP, imports=import_report())
+    if not WARM_UP['ready']:
+        return JSONResponse(body, status_code=503, headers={'Retry-After': '1'})
+    return JSONResponse(body)
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+def prometheus_metrics():
+    queue = RENDER_QUEUE.stats()
+    for state in ('in_flight', 'queued', 'admitted', 'rejected', 'timed_out', 'cancelled'):
+        QUEUE_GAUGE.set(queue[state], state=state)
+    cache = RENDER_CACHE.stats()
+    for field in ('entries', 'bytes', 'hits', 'disk_hits', 'shared_hits', 'misses', 'evictions'):
+        CACHE_GAUGE.set(cache[field], field=field)
+    jobs = RENDER_JOBS.stats()['jobs']
+    for status in ('queued', 'running', 'done', 'failed'):
+        JOBS_GAUGE.set(jobs.get(status, 0), status=status)
+    return PlainTextResponse(metrics.render_metrics(), media_type='text/plain; version=0.0.4')
+
+
 @app.post('/api/generate')
 async def generate(request: Request):
     payload = await request.json()
@@ -57,19 +233,152 @@ async def generate(request: Request):
 
     defaults = (payload or {}).get('defaults') or {}
     data = parse_text(text, defaults=defaults)
-    html = render_html(data, str(TEMPLATES_DIR), template_name=template_name)
+    key = resume_key(data, TEMPLATES_DIR, template_name)
+    etag = f'"{key}"'
+    headers = {
+        'Content-Disposition': 'attachment; filename="Dmitry.pdf"',
+        'ETag': etag,
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    pdf_bytes = await RENDER_CACHE.aget(key)
+    if pdf_bytes is None:
+        html = _cached_html(data, template_name)
+        try:
+            pdf_bytes = await RENDER_QUEUE.submit(
+                lambda: html_to_pdf_bytes_async(html, base_url=str(TEMPLATES_DIR)),
+                client_gone=lambda: _client_gone(request),
+            )
+        except QueueRejected as e:
+            status = 429 if isinstance(e, QueueFull) else 503
+            raise HTTPException(status_code=status, detail=str(e), headers={'Retry-After': str(e.retry_after)}) from e
+        except ClientGone:
+            return Response(status_code=499)
+        except Exception as e:
+            raise _render_failed(e) from e
+        await RENDER_CACHE.aput(key, pdf_bytes)
 
-    pdf_path = BASE_DIR / 'Dmitry.pdf'
+    return Response(content=pdf_bytes, media_type='application/pdf', headers=headers)
+
+
+@app.post('/api/jobs', status_code=202)
+async def submit_job(request: Request):
+    payload = await request.json()
+    text = (payload or {}).get('text', '')
+    template_name = _safe_template_name((payload or {}).get('template'))
+    if not text.strip():
+        raise HTTPException(status_code=400, detail='Empty text')
 
+    defaults = (payload or {}).get('defaults') or {}
+    data = parse_text(text, defaults=defaults)
+    key = resume_key(data, TEMPLATES_DIR, template_name)
+    cached = await RENDER_CACHE.aget(key)
+    html = None if cached is not None else _cached_html(data, template_name)
     try:
-        await asyncio.to_thread(html_to_pdf, html, str(pdf_path), base_url=str(TEMPLATES_DIR))
-    except Exception as e:
-        raise HTTPException(status_code=409, detail='Please close the opened Dmitry.pdf and try again.') from e
+        job = await RENDER_JOBS.submit(html, template_name, key, pdf=cached)
+    except JobsFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={'Retry-After': '5'}) from e
+    body = job.to_dict(RENDER_JOBS.ttl)
+    body['status_url'] = f'/api/jobs/{job.id}'
+    body['pdf_url'] = f'/api/jobs/{job.id}/pdf'
+    return JSONResponse(body, status_code=202)
+
+
+@app.get('/api/jobs/{job_id}')
+async def job_status(job_id: str):
+    job = await RENDER_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail='Unknown or expired job')
+    return JSONResponse(job.to_dict(RENDER_JOBS.ttl))
+
+
+@app.get('/api/jobs/{job_id}/pdf')
+async def job_pdf(job_id: str):
+    job = await RENDER_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail='Unknown or expired job')
+    if job.status != 'done':
+        raise HTTPException(status_code=409, detail=f'Job is {job.status}' + (f': {job.error}' if job.error else ''))
+    return Response(content=job.pdf, media_type='application/pdf', headers={
+        'Content-Disposition': 'attachment; filename="Dmitry.pdf"',
+        'ETag': f'"{job.cache_key}"',
+    })
+
+
+@app.post('/api/compare')
+async def compare(request: Request):
+    payload = await request.json()
+    text = (payload or {}).get('text', '')
+    if not text.strip():
+        raise HTTPException(status_code=400, detail='Empty text')
+    fmt = (payload or {}).get('format') or 'html'
+    if fmt not in ('html', 'pdf'):
+        raise HTTPException(status_code=400, detail='format must be "html" or "pdf"')
+    requested = (payload or {}).get('templates')
+    if requested is None:
+        requested = sorted(ALLOWED_TEMPLATES)
+    if not isinstance(requested, list) or not requested:
+        raise HTTPException(status_code=400, detail='templates must be a non-empty list of template names')
+    # unlike the single-template endpoints, unknown names are an error here:
+    # substituting the default would compare templates nobody asked for
+    unknown = [t for t in requested if not isinstance(t, str) or t.strip() not in ALLOWED_TEMPLATES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f'Unknown templates: {", ".join(map(str, unknown))}')
+    template_names = list(dict.fromkeys(t.strip() for t in requested))
 
-    pdf_bytes = pdf_path.read_bytes()
+    # parse once, render every template from the same data
+    defaults = (payload or {}).get('defaults') or {}
+    data = parse_text(text, defaults=defaults)
+    htmls = {t: _cached_html(data, t) for t in template_names}
+    if fmt == 'html':
+        files = {output_name(t, 'html'): h.encode('utf-8') for t, h in htmls.items()}
+    else:
+        async def render_pdf(template_name):
+            key = resume_key(data, TEMPLATES_DIR, template_name)
+            pdf_bytes = await RENDER_CACHE.aget(key)
+            if pdf_bytes is None:
+                html = htmls[template_name]
+                pdf_bytes = await RENDER_QUEUE.submit(
+                    lambda: html_to_pdf_bytes_async(html, base_url=str(TEMPLATES_DIR)),
+                    # shielded: one queued render giving up must not stop the shared watcher
+                    client_gone=lambda: asyncio.shield(gone),
+                )
+                await RENDER_CACHE.aput(key, pdf_bytes)
+            return pdf_bytes
+
+        # Only one task may read the request's receive channel, so every
+        # render shares one disconnect watcher. The first failure (queue full,
+        # disconnect, render error) cancels the renders still queued or running.
+        gone = asyncio.create_task(_client_gone(request))
+        tasks = [asyncio.create_task(render_pdf(t)) for t in template_names]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            failed = next((task for task in tasks if task in done and task.exception() is not None), None)
+            if failed is not None:
+                raise failed.exception()
+            pdfs = [task.result() for task in tasks]
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        except ClientGone:
+            return Response(status_code=499)
+        except QueueRejected as e:
+            status = 429 if isinstance(e, QueueFull) else 503
+            raise HTTPException(status_code=status, detail=str(e), headers={'Retry-After': str(e.retry_after)}) from e
+        except Exception as e:
+            raise _render_failed(e) from e
+        finally:
+            gone.cancel()
+        files = {output_name(t, 'pdf'): pdf for t, pdf in zip(template_names, pdfs)}
 
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type='application/pdf', headers={
-        'Content-Disposition': 'attachment; filename="Dmitry.pdf"'
+    archive = await asyncio.to_thread(build_zip, files)
+    return Response(content=archive, media_type='application/zip', headers={
+        'Content-Disposition': 'attachment; filename="templates.zip"'
     })
 
 
@@ -83,19 +392,159 @@ async def preview(request: Request):
 
     defaults = (payload or {}).get('defaults') or {}
     data = parse_text(text, defaults=defaults)
-    html = render_html(data, str(TEMPLATES_DIR), template_name=template_name)
-    return HTMLResponse(content=html)
+    key = cache_key('html', data, TEMPLATES_DIR, template_name)
+    etag = f'"{key}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    html = _cached_html(data, template_name, key)
+    return HTMLResponse(content=html, headers={'ETag': etag})
+
+
+@app.post('/api/preview/incremental', response_class=HTMLResponse)
+async def preview_incremental(request: Request):
+    payload = await request.json() or {}
+    text = payload.get('text', '')
+    if not text.strip():
+        raise HTTPException(status_code=400, detail='Empty text')
+    template_name = _safe_template_name(payload.get('template'))
+    session = PREVIEW_SESSIONS.get(payload.get('session'))
+    html, stats = await asyncio.to_thread(
+        session.render, text, template_name, str(TEMPLATES_DIR), payload.get('defaults') or {})
+    return HTMLResponse(content=html, headers={
+        'X-Preview-Session': session.id,
+        'X-Preview-Reparsed': f"{stats['reparsed']}/{stats['sections']}",
+    })
+
+
+@app.websocket('/ws/preview')
+async def preview_ws(websocket: WebSocket):
+    # One session per connection; the client sends {text, template, defaults}
+    # on every edit and only gets HTML back when the output actually changed.
+    await websocket.accept()
+    session = PREVIEW_SESSIONS.get()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            text = (payload or {}).get('text', '')
+            if not text.strip():
+                await websocket.send_json({'type': 'error', 'detail': 'Empty text'})
+                continue
+            template_name = _safe_template_name(payload.get('template'))
+            try:
+                html, stats = await asyncio.to_thread(
+                    session.render, text, template_name, str(TEMPLATES_DIR), payload.get('defaults') or {})
+            except Exception as e:
+                await websocket.send_json({'type': 'error', 'detail': str(e)})
+                continue
+            if stats['rendered']:
+                await websocket.send_json({'type': 'html', 'html': html, 'reparsed': stats['reparsed'], 'sections': stats['sections']})
+            else:
+                await websocket.send_json({'type': 'unchanged', 'reparsed': stats['reparsed'], 'sections': stats['sections']})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        PREVIEW_SESSIONS.drop(session.id)
 
 
 @app.get('/api/preview-template', response_class=HTMLResponse)
-def preview_template(template: str = 'resume_minimal.html'):
+def preview_template(request: Request, template: str = 'resume_minimal.html'):
     template_name = _safe_template_name(template)
-    sample_path = BASE_DIR / 'sample_input.json'
-    if not sample_path.exists():
+    try:
+        html, version = GALLERY.html(template_name)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail='sample_input.json not found')
-    data = json.loads(sample_path.read_text(encoding='utf-8-sig'))
-    html = render_html(data, str(TEMPLATES_DIR), template_name=template_name)
-    return HTMLResponse(content=html)
+    etag = f'"{version}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    return HTMLResponse(content=html, headers={'ETag': etag})
+
+
+@app.get('/api/preview-template/pdf')
+async def preview_template_pdf(request: Request, template: str = 'resume_minimal.html'):
+    template_name = _safe_template_name(template)
+    try:
+        pdf, version = await asyncio.to_thread(GALLERY.pdf, template_name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail='sample_input.json not found')
+    # the version does not depend on the PDF, so a revalidation never renders
+    etag = f'"{version}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+    if pdf is None:
+        try:
+            pdf = await GALLERY.render_pdf(template_name)
+        except QueueRejected as e:
+            raise HTTPException(status_code=429 if isinstance(e, QueueFull) else 503, detail=str(e),
+                                headers={'Retry-After': str(e.retry_after)}) from e
+        except Exception as e:
+            raise _render_failed(e) from e
+    return Response(content=pdf, media_type='application/pdf', headers={
+        'ETag': etag,
+        'Content-Disposition': f'inline; filename="{output_name(template_name, "pdf")}"',
+    })
+
+
+@app.post('/api/bundle')
+async def bundle(request: Request):
+    payload = await request.json()
+    text = (payload or {}).get('text', '')
+    template_name = _safe_template_name((payload or {}).get('template'))
+    order = (payload or {}).get('order') or 'resume-first'
+    if not text.strip():
+        raise HTTPException(status_code=400, detail='Empty text')
+    if order not in ORDERS:
+        raise HTTPException(status_code=400, detail=f'order must be one of: {", ".join(ORDERS)}')
+
+    defaults = (payload or {}).get('defaults') or {}
+    data = parse_text(text, defaults=defaults)
+    if not has_letter(data):
+        raise HTTPException(status_code=400, detail='No cover letter section in text')
+
+    # resume and letter are cached as separate PDFs; a new letter only
+    # re-renders its own page
+    fragments = [
+        ('resume', resume_key(data, TEMPLATES_DIR, template_name), resume_data(data, TEMPLATES_DIR, template_name), template_name),
+        ('letter', letter_key(data, TEMPLATES_DIR), letter_data(data), LETTER_TEMPLATE),
+    ]
+    if order == 'letter-first':
+        fragments.reverse()
+    etag = '"' + '-'.join(key[:32] for _, key, _, _ in fragments) + '"'
+    headers = {
+        'Content-Disposition': 'attachment; filename="Dmitry.pdf"',
+        'ETag': etag,
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    pdfs = []
+    rendered = []
+    for name, key, fragment_data, fragment_template in fragments:
+        pdf_bytes = await RENDER_CACHE.aget(key)
+        if pdf_bytes is None:
+            html = _cached_html(fragment_data, fragment_template)
+            try:
+                pdf_bytes = await RENDER_QUEUE.submit(
+                    lambda: html_to_pdf_bytes_async(html, base_url=str(TEMPLATES_DIR)),
+                    client_gone=lambda: _client_gone(request),
+                )
+            except QueueRejected as e:
+                status = 429 if isinstance(e, QueueFull) else 503
+                raise HTTPException(status_code=status, detail=str(e), headers={'Retry-After': str(e.retry_after)}) from e
+            except ClientGone:
+                return Response(status_code=499)
+            except Exception as e:
+                raise _render_failed(e, f'{name} PDF') from e
+            await RENDER_CACHE.aput(key, pdf_bytes)
+            rendered.append(name)
+        pdfs.append(pdf_bytes)
+
+    try:
+        with metrics.stage_timer('compose'):
+            pdf_bytes = await asyncio.to_thread(merge_pdfs, pdfs)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'Failed to merge PDFs: {e}') from e
+    headers['X-Bundle-Rendered'] = ','.join(rendered) or 'none'
+    return Response(content=pdf_bytes, media_type='application/pdf', headers=headers)
 
 
 @app.post('/api/coverletter')
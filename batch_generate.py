@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from renderer_select import RENDERER_CHOICES
+from resume_model import Resume
+
+# Per-process renderer settings, filled in by _init_worker
+_WORKER = {}
+
+
+def _valid_name(name):
+    # Names become output file names inside --output-dir
+    return name not in ('.', '..') and not any(c in name for c in '/\\\0')
+
+
+def _dedupe_names(items):
+    # Inputs with the same stem (e.g. a/cv.json and b/cv.json) would write
+    # the same output file; later ones get a -2, -3, ... suffix instead.
+    # Compared case-insensitively for case-insensitive file systems.
+    seen = set()
+    for item in items:
+        name = item['name']
+        n = 2
+        while name.casefold() in seen:
+            name = f"{item['name']}-{n}"
+            n += 1
+        seen.add(name.casefold())
+        item['name'] = name
+    return items
+
+
+def _jsonl_items(path):
+    stem = Path(path).stem
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            name = f'{stem}-{lineno:04d}'
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield {'name': name, 'source': f'{path}:{lineno}', 'error': f'Invalid JSON: {e}'}
+                continue
+            # Either a bare resume dict or {"name": ..., "data": {...}}
+            if isinstance(record, dict) and isinstance(record.get('data'), dict):
+                given = str(record.get('name') or '').strip()
+                if given and not _valid_name(given):
+                    yield {'name': name, 'source': f'{path}:{lineno}',
+                           'error': f'Invalid name {given!r}: it becomes a file name and cannot contain path separators'}
+                    continue
+                yield {'name': given or name, 'source': f'{path}:{lineno}', 'data': record['data']}
+            else:
+                yield {'name': name, 'source': f'{path}:{lineno}', 'data': record}
+
+
+def collect_inputs(sources):
+    items = []
+    for source in sources:
+        if source.lower().endswith('.jsonl') and os.path.isfile(source):
+            items.extend(_jsonl_items(source))
+            continue
+        if os.path.isdir(source):
+            paths = sorted(str(p) for p in Path(source).glob('*.json'))
+        else:
+            paths = sorted(glob.glob(source))
+        for p in paths:
+            items.append({'name': Path(p).stem, 'source': p, 'path': p})
+    return _dedupe_names(items)
+
+
+def _output_name(item, template, multiple_templates, html_only):
+    ext = '.html' if html_only else '.pdf'
+    if multiple_templates:
+        return f"{item['name']}__{Path(template).stem}{ext}"
+    return f"{item['name']}{ext}"
+
+
+def _init_worker(templates_dir, browser_path, html_only):
+    # Each process renders one document at a time, so one warm page is enough.
+    os.environ.setdefault('RESUME_PDF_POOL_SIZE', '1')
+    from generate_resume import html_to_pdf_bytes, precompile_templates
+
+    _WORKER.update(templates_dir=templates_dir, browser_path=browser_path, html_only=html_only)
+    precompile_templates(templates_dir)
+    if html_only:
+        return
+    try:
+        html_to_pdf_bytes('<!doctype html><html><body></body></html>', base_url=os.path.abspath(templates_dir), browser_path=browser_path)
+    except Exception as e:
+        print(f'Renderer warm-up failed in worker {os.getpid()}: {e}', file=sys.stderr)
+
+
+def _render_job(item, template, output_path):
+    from generate_resume import html_to_pdf_bytes, load_resume, render_html, write_html_file
+
+    start = time.perf_counter()
+    result = {'name': item['name'], 'source': item['source'], 'template': template, 'output': output_path}
+    try:
+        if 'error' in item:
+            raise ValueError(item['error'])
+        data = Resume.from_dict(item['data']) if 'data' in item else load_resume(item['path'])
+        templates_dir = _WORKER['templates_dir']
+        html = render_html(data, templates_dir, template)
+        if _WORKER['html_only']:
+            write_html_file(html, output_path)
+        else:
+            pdf_bytes = html_to_pdf_bytes(html, base_url=os.path.abspath(templates_dir), browser_path=_WORKER['browser_path'])
+            with open(output_path, 'wb') as f:
+                f.write(pdf_bytes)
+        result['ok'] = True
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(sources, output_dir, templates, templates_dir='templates', jobs=None, html_only=False, browser_path=None):
+    items = collect_inputs(sources)
+    templates = templates or ['resume.html']
+    multiple = len(templates) > 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    work = []
+    for item in items:
+        for template in templates:
+            out = os.path.join(output_dir, _output_name(item, template, multiple, html_only))
+            work.append((item, template, out))
+
+    total = len(work)
+    results = []
+    start = time.perf_counter()
+    if total:
+        workers = max(1, min(jobs or os.cpu_count() or 1, total))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(templates_dir, browser_path, html_only)) as pool:
+            futures = [pool.submit(_render_job, *w) for w in work]
+            for done, fut in enumerate(as_completed(futures), 1):
+                try:
+                    res = fut.result()
+                except Exception as e:
+                    # the worker process itself died; the job is lost but the batch goes on
+                    res = {'ok': False, 'name': '?', 'template': '?', 'error': f'{type(e).__name__}: {e}', 'seconds': None}
+                results.append(res)
+                status = 'ok' if res['ok'] else 'FAIL'
+                line = f"[{done}/{total}] {status} {res['name']} ({res['template']})"
+                if not res['ok']:
+                    line += f" - {res['error']}"
+                print(line, flush=True)
+
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if not r['ok']]
+    return {
+        'total': total,
+        'succeeded': total - len(failed),
+        'failed': len(failed),
+        'seconds': round(elapsed, 3),
+        'docs_per_second': round(total / elapsed, 2) if elapsed > 0 and total else 0,
+        'templates': templates,
+        'results': sorted(results, key=lambda r: (str(r.get('source')), r['template'])),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='generate_resume.py batch', description='Render many JSON resumes in parallel')
+    parser.add_argument('inputs', nargs='+', help='Directories of *.json, glob patterns, or .jsonl manifests')
+    parser.add_argument('--output-dir', '-o', default='batch_output', help='Directory for generated files')
+    parser.add_argument('--templates', '-t', default='templates', help='Templates directory')
+    parser.add_argument('--template', action='append', help='Template file name; repeat to render every input with several templates')
+    parser.add_argument('--jobs', '-j', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--html-only', action='store_true', help='Write HTML files instead of PDFs')
+    parser.add_argument('--browser', '-b', help='Path to Chrome/Edge executable to use as fallback renderer')
+    parser.add_argument('--renderer', choices=RENDERER_CHOICES, help='PDF backend to use (default: RESUME_PDF_RENDERER or auto)')
+    parser.add_argument('--report', help='Summary report path (default: <output-dir>/batch_report.json)')
+    args = parser.parse_args(argv)
+    if args.renderer:
+        # worker processes inherit the environment and read it on import
+        os.environ['RESUME_PDF_RENDERER'] = args.renderer
+
+    summary = run_batch(args.inputs, args.output_dir, args.template, templates_dir=args.templates,
+                        jobs=args.jobs, html_only=args.html_only, browser_path=args.browser)
+    report = args.report or os.path.join(args.output_dir, 'batch_report.json')
+    Path(report).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"Done: {summary['succeeded']}/{summary['total']} succeeded in {summary['seconds']}s. Report: {report}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import generate_resume
+from generate_resume import render_html
+from parse_input_text import parse_text
+
+BASE_DIR = Path(__file__).resolve().parent
+BACKENDS = ('weasyprint', 'weasyprint-uncached', 'playwright', 'cdp')
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(samples):
+    ms = [s * 1000 for s in samples]
+    if not ms:
+        return {'n': 0}
+    return {
+        'n': len(ms),
+        'mean_ms': round(sum(ms) / len(ms), 3),
+        'min_ms': round(min(ms), 3),
+        'p50_ms': round(_percentile(ms, 50), 3),
+        'p95_ms': round(_percentile(ms, 95), 3),
+        'p99_ms': round(_percentile(ms, 99), 3),
+        'max_ms': round(max(ms), 3),
+    }
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def timed(fn, iterations, warmup=0):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def synthetic_text(jobs, bullets, skills, source=None):
+    # Scales the sections of inputdata.txt up (or down) to the requested size,
+    # reusing its real lines so the parser sees the usual shapes.
+    source = source or (BASE_DIR / 'inputdata.txt')
+    sample = parse_text(Path(source).read_text(encoding='utf-8-sig'))
+    work = sample.get('work experience') or [{'company name': 'Acme', 'role': 'Developer', 'period': '2020 - 2021', 'experience': ['Did things']}]
+    bullet_pool = [b for job in work for b in job.get('experience', [])] or ['Did things']
+    skill_pool = sample.get('skills') or ['Languages: Python']
+
+    out = [sample.get('name', ''), sample.get('email', ''), sample.get('address', ''), sample.get('telegram_address', ''), '']
+    out += ['ОБО МНЕ', ''] + list(sample.get('about me', [])) + ['']
+    out += ['НАВЫКИ', '']
+    for i in range(skills):
+        line = skill_pool[i % len(skill_pool)]
+        out.append(line if i < len(skill_pool) else f'{line}, #{i}')
+    out += ['', 'КОММЕРЧЕСКИЙ ОПЫТ', '']
+    for j in range(jobs):
+        job = work[j % len(work)]
+        out += [job.get('role', ''), job.get('company name', ''), job.get('period', ''), '']
+        for b in range(bullets):
+            out.append(' ' + bullet_pool[(j * bullets + b) % len(bullet_pool)])
+        out.append('')
+    return '\n'.join(out)
+
+
+def pdf_backends(browser_path=None):
+    # name -> zero-argument factory returning render(html, base_url) -> bytes,
+    # or a string explaining why the backend is unusable here
+    backends = {}
+    caps = generate_resume._probe_renderers(browser_path)
+    if not caps['weasyprint']:
+        # shared font configuration and parsed template CSS vs. a cold parse per document
+        backends['weasyprint'] = lambda: lambda html, base_url: generate_resume._weasyprint_pdf(html, base_url, cached=True)
+        backends['weasyprint-uncached'] = lambda: lambda html, base_url: generate_resume._weasyprint_pdf(html, base_url, cached=False)
+    else:
+        backends['weasyprint'] = backends['weasyprint-uncached'] = caps['weasyprint']
+
+    if not caps['playwright']:
+        def playwright():
+            pool = generate_resume.get_pool()
+            return lambda html, base_url: pool.render(html)
+        backends['playwright'] = playwright
+    else:
+        backends['playwright'] = caps['playwright']
+
+    if caps['cdp']:
+        backends['cdp'] = caps['cdp']
+    else:
+        def cdp():
+            session = generate_resume.get_cdp_session(generate_resume._chrome_bins(browser_path)[0])
+            return lambda html, base_url: session.print_pdf(html)
+        backends['cdp'] = cdp
+    return backends
+
+
+def run(args):
+    templates_dir = args.templates
+    templates = args.template or sorted(p.name for p in Path(templates_dir).glob('*.html'))
+    text = synthetic_text(args.jobs, args.bullets, args.skills)
+    base_url = os.path.abspath(templates_dir)
+
+    data = parse_text(text)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': {'jobs': args.jobs, 'bullets': args.bullets, 'skills': args.skills,
+                 'text_lines': text.count('\n') + 1, 'parsed_jobs': len(data.get('work experience', []))},
+        'iterations': args.iterations,
+        'pdf_iterations': args.pdf_iterations,
+        'parse': summarize(timed(lambda: parse_text(text), args.iterations, args.warmup)),
+        'render': {},
+        'pdf': {},
+        'skipped': {},
+    }
+
+    htmls = {}
+    for name in templates:
+        htmls[name] = render_html(data, templates_dir, name)
+        report['render'][name] = summarize(timed(lambda: render_html(data, templates_dir, name), args.iterations, args.warmup))
+
+    wanted = args.backend or list(BACKENDS)
+    for backend, factory in pdf_backends(args.browser).items():
+        if backend not in wanted:
+            continue
+        if isinstance(factory, str):
+            report['skipped'][backend] = factory
+            continue
+        try:
+            render = factory()
+        except Exception as e:
+            report['skipped'][backend] = f'Failed to start: {e}'
+            continue
+        report['pdf'][backend] = {}
+        for name, html in htmls.items():
+            try:
+                samples = timed(lambda: render(html, base_url), args.pdf_iterations, 1)
+            except Exception as e:
+                report['pdf'][backend][name] = {'error': str(e)}
+                continue
+            report['pdf'][backend][name] = summarize(samples)
+        print(f'Benchmarked {backend}', file=sys.stderr)
+
+    report['peak_rss_kb'] = peak_rss_kb()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time parse_text, render_html and each PDF backend on synthetic resumes')
+    parser.add_argument('--jobs', type=int, default=3, help='Jobs in the synthetic resume')
+    parser.add_argument('--bullets', type=int, default=8, help='Bullets per job')
+    parser.add_argument('--skills', type=int, default=12, help='Skill lines')
+    parser.add_argument('--iterations', '-n', type=int, default=50, help='Timed runs for parse and render')
+    parser.add_argument('--pdf-iterations', type=int, default=5, help='Timed runs per PDF backend and template')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed runs before parse/render timing')
+    parser.add_argument('--templates', '-t', default=str(BASE_DIR / 'templates'), help='Templates directory')
+    parser.add_argument('--template', action='append', help='Template to benchmark; repeat for several (default: all)')
+    parser.add_argument('--backend', action='append', choices=BACKENDS, help='PDF backend to benchmark; repeat for several (default: all available)')
+    parser.add_argument('--browser', '-b', help='Path to Chrome/Edge executable for the CDP backend')
+    parser.add_argument('--output', '-o', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(out, encoding='utf-8')
+        print(f'Wrote {args.output}')
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import atexit
+import base64
+import json
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from lazy_imports import optional_import
+
+
+PRINT_PARAMS = {
+    'printBackground': True,
+    'displayHeaderFooter': False,
+    'paperWidth': 8.27,
+    'paperHeight': 11.69,
+    'marginTop': 0.4,
+    'marginBottom': 0.4,
+    'marginLeft': 0.4,
+    'marginRight': 0.4,
+}
+
+# Resolves once the injected document has loaded its images and stylesheets
+# and its web fonts are ready; checking readyState first means a load event
+# that fired before the call is not waited for in vain.
+WAIT_FOR_LOAD = '''new Promise(resolve => {
+    if (document.readyState === 'complete') resolve();
+    else window.addEventListener('load', () => resolve(), {once: true});
+}).then(() => document.fonts.ready).then(() => true)'''
+
+
+class CdpError(RuntimeError):
+    pass
+
+
+# One headless Chrome process plus one browser-level DevTools websocket,
+# reused for every document. Each job gets its own target (tab) attached in
+# flat-session mode; the HTML is injected with Page.setDocumentContent, so no
+# HTTP server or temp HTML file is involved.
+class CdpSession:
+
+    def __init__(self, bin_path, launch_timeout=10, call_timeout=30):
+        self.bin_path = bin_path
+        self.launch_timeout = launch_timeout
+        self.call_timeout = call_timeout
+        self.renders = 0
+        self._proc = None
+        self._ws = None
+        self._user_data = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def alive(self):
+        return self._ws is not None and self._proc is not None and self._proc.poll() is None
+
+    def start(self):
+        websocket = optional_import('websocket')
+        if websocket is None:
+            raise CdpError('websocket-client not installed')
+        self._user_data = tempfile.mkdtemp(prefix='chrome-user-')
+        try:
+            self._proc = subprocess.Popen(
+                [self.bin_path, '--remote-debugging-port=0', f'--user-data-dir={self._user_data}',
+                 '--no-first-run', '--no-default-browser-check', '--headless=new', '--disable-gpu',
+                 '--no-sandbox', 'about:blank'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            )
+            ws_url = self._wait_for_devtools_url()
+            self._ws = websocket.create_connection(ws_url, timeout=self.call_timeout, suppress_origin=True)
+        except Exception:
+            self.close()
+            raise
+
+    def _wait_for_devtools_url(self):
+        # Chrome announces the browser websocket on stderr once it is ready;
+        # a reader thread hands it over and keeps draining the pipe afterwards.
+        lines = queue.Queue()
+
+        def pump(stream):
+            for raw in iter(stream.readline, b''):
+                lines.put(raw.decode('utf-8', 'replace'))
+            lines.put(None)
+
+        threading.Thread(target=pump, args=(self._proc.stderr,), daemon=True).start()
+        deadline = time.monotonic() + self.launch_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CdpError('Timed out waiting for Chrome DevTools endpoint')
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise CdpError('Chrome exited before opening the DevTools endpoint')
+            if 'DevTools listening on ' in line:
+                return line.split('DevTools listening on ', 1)[1].strip()
+
+    def _call(self, method, params=None, session_id=None):
+        self._next_id += 1
+        msg_id = self._next_id
+        msg = {'id': msg_id, 'method': method, 'params': params or {}}
+        if session_id:
+            msg['sessionId'] = session_id
+        self._ws.send(json.dumps(msg))
+        deadline = time.monotonic() + self.call_timeout
+        while time.monotonic() < deadline:
+            resp = self._ws.recv()
+            if not resp:
+                continue
+            data = json.loads(resp)
+            # events and replies for other sessions are irrelevant here
+            if data.get('id') != msg_id:
+                continue
+            if 'error' in data:
+                raise CdpError(f"{method} failed: {data['error'].get('message')}")
+            return data.get('result', {})
+        raise CdpError(f'{method} timed out')
+
+    def print_pdf(self, html_string):
+        with self._lock:
+            if not self.alive:
+                raise CdpError('CDP session is not running')
+            target_id = self._call('Target.createTarget', {'url': 'about:blank'})['targetId']
+            try:
+                session_id = self._call('Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+                frame_id = self._call('Page.getFrameTree', session_id=session_id)['frameTree']['frame']['id']
+                self._call('Page.setDocumentContent', {'frameId': frame_id, 'html': html_string}, session_id=session_id)
+                # like Playwright's wait_until='load': fonts and images first
+                loaded = self._call('Runtime.evaluate', {'expression': WAIT_FOR_LOAD, 'awaitPromise': True,
+                                                         'returnByValue': True}, session_id=session_id)
+                if 'exceptionDetails' in loaded:
+                    raise CdpError(f"Waiting for the page to load failed: {loaded['exceptionDetails'].get('text')}")
+                result = self._call('Page.printToPDF', PRINT_PARAMS, session_id=session_id)
+            finally:
+                try:
+                    self._call('Target.closeTarget', {'targetId': target_id})
+                except Exception:
+                    pass
+            self.renders += 1
+            return base64.b64decode(result['data'])
+
+    def close(self):
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+        if self._proc is not None:
+            try:
+                self._proc.terminate()
+                self._proc.wait(timeout=3)
+            except Exception:
+                try:
+                    self._proc.kill()
+                    self._proc.wait(timeout=3)
+                except Exception:
+                    pass
+            self._proc = None
+        if self._user_data is not None:
+            shutil.rmtree(self._user_data, ignore_errors=True)
+            self._user_data = None
+
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def cdp_available():
+    return optional_import('websocket') is not None
+
+
+def get_cdp_session(bin_path):
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(bin_path)
+        if session is not None and session.alive:
+            return session
+        if session is not None:
+            session.close()
+        session = CdpSession(bin_path)
+        session.start()
+        _SESSIONS[bin_path] = session
+        return session
+
+
+def discard_cdp_session(bin_path):
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.pop(bin_path, None)
+    if session is not None:
+        session.close()
+
+
+def close_cdp_sessions():
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_cdp_sessions)
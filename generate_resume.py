@@ -1,40 +1,25 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
 import os
+import re
 import shutil
-import subprocess
 import tempfile
 import sys
-import time
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
-try:
-    from weasyprint import HTML
-except Exception:
-    HTML = None
-
-try:
-    import websocket
-except Exception:
-    websocket = None
-
-try:
-    from playwright.sync_api import sync_playwright
-except Exception:
-    sync_playwright = None
-
-try:
-    from playwright.async_api import async_playwright
-except Exception:
-    async_playwright = None
-
-import urllib.request
-import urllib.parse
-import json as _json
-import base64
+from cdp_session import cdp_available, discard_cdp_session, get_cdp_session
+from lazy_imports import import_error, module_installed, optional_import
+from metrics import backend_attempt, stage_timer
+from playwright_pool import get_async_renderer, get_pool
+from renderer_select import RENDERER_CHOICES, RendererSelector, first_line
+from resume_model import Resume
 
 
 def load_json(path):
@@ -42,196 +27,165 @@ def load_json(path):
         return json.load(f)
 
 
-def render_html(data, templates_dir, template_name='resume.html'):
-    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(['html', 'xml']))
-    template = env.get_template(template_name)
-    return template.render(data=data)
-
-
-def _cdp_print(page_url, output_path, bin_path, tmp_html):
-    import socket
-    s = socket.socket()
-    s.bind(('127.0.0.1', 0))
-    debug_port = s.getsockname()[1]
-    s.close()
-
-    user_data = tempfile.mkdtemp(prefix='chrome-user-')
-    proc = subprocess.Popen([bin_path, f'--remote-debugging-port={debug_port}', f'--user-data-dir={user_data}', '--no-first-run', '--no-default-browser-check', '--headless=new', '--disable-gpu', '--no-sandbox'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-    server_dir = tempfile.mkdtemp(prefix='htmlserver-')
-    serve_name = 'resume_temp.html'
-    shutil.copy(tmp_html, os.path.join(server_dir, serve_name))
+def load_resume(path):
+    return Resume.from_dict(load_json(path))
 
-    s = socket.socket()
-    s.bind(('127.0.0.1', 0))
-    port = s.getsockname()[1]
-    s.close()
 
-    server_proc = subprocess.Popen([sys.executable, '-m', 'http.server', str(port), '--bind', '127.0.0.1'], cwd=server_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    served_url = f'http://127.0.0.1:{port}/{serve_name}'
+_ENVIRONMENTS = {}
+_ENVIRONMENTS_LOCK = threading.Lock()
 
-    info = None
-    deadline = time.time() + 8
-    while time.time() < deadline:
-        try:
-            q = urllib.parse.quote(served_url, safe=':/?&=')
-            with urllib.request.urlopen(f'http://127.0.0.1:{debug_port}/json/new?' + q) as r:
-                info = _json.loads(r.read().decode('utf-8'))
-            if info and info.get('webSocketDebuggerUrl'):
-                break
-        except Exception:
-            time.sleep(0.25)
-
-    if not info or not info.get('webSocketDebuggerUrl'):
-        try:
-            proc.terminate()
-        except Exception:
-            pass
-        try:
-            server_proc.terminate()
-        except Exception:
-            pass
-        return False
 
-    ws_url = info.get('webSocketDebuggerUrl')
-    ws = websocket.create_connection(ws_url, timeout=10)
+def _auto_reload_enabled():
+    # On by default: cache keys and gallery versions follow the template's
+    # mtime, so the compiled template has to follow it too or stale output is
+    # cached under the new key. Only turn it off for read-only template dirs.
+    return os.environ.get('RESUME_TEMPLATE_AUTO_RELOAD', '1').lower() not in ('0', 'false', 'no')
 
-    ws.send(_json.dumps({'id': 1, 'method': 'Page.enable'}))
-    ws.send(_json.dumps({'id': 2, 'method': 'Page.navigate', 'params': {'url': served_url}}))
 
-    deadline = time.time() + 12
-    while time.time() < deadline:
-        try:
-            resp = ws.recv()
-        except Exception:
-            break
-        if not resp:
-            continue
-        rj = _json.loads(resp)
-        if rj.get('method') == 'Page.loadEventFired':
-            break
-
-    msg = {'id': 3, 'method': 'Page.printToPDF', 'params': {'printBackground': True, 'displayHeaderFooter': False, 'paperWidth': 8.27, 'paperHeight': 11.69, 'marginTop': 0.4, 'marginBottom': 0.4, 'marginLeft': 0.4, 'marginRight': 0.4}}
-    ws.send(_json.dumps(msg))
-
-    pdf_data = None
-    deadline = time.time() + 15
-    while time.time() < deadline:
-        try:
-            resp = ws.recv()
-        except Exception:
-            break
-        if not resp:
-            continue
-        respj = _json.loads(resp)
-        if respj.get('id') == 3 and 'result' in respj:
-            pdf_data = respj['result'].get('data')
-            break
-
-    ws.close()
-    if pdf_data:
-        with open(output_path, 'wb') as outf:
-            outf.write(base64.b64decode(pdf_data))
-        try:
-            urllib.request.urlopen(f'http://127.0.0.1:{debug_port}/json/close/' + info.get('id',''))
-        except Exception:
-            pass
-        try:
-            proc.terminate()
-        except Exception:
-            pass
-        try:
-            proc.wait(timeout=3)
-        except Exception:
-            pass
-        try:
-            server_proc.terminate()
-        except Exception:
-            pass
-        try:
-            server_proc.wait(timeout=3)
-        except Exception:
-            pass
-        return True
-
-    try:
-        proc.terminate()
-    except Exception:
-        pass
-    try:
-        server_proc.terminate()
-    except Exception:
-        pass
-    return False
-
-
-def _playwright_print(tmp_html, output_path):
-    if sync_playwright is None:
-        print('Playwright not available; skipping Playwright renderer')
-        return False
+def _bytecode_cache():
+    cache_dir = os.environ.get('RESUME_JINJA_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'resume-jinja-cache')
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(Path(tmp_html).resolve().as_uri(), wait_until='networkidle')
-            page.emulate_media(media='print')
-            page.pdf(
-                path=output_path,
-                format='A4',
-                print_background=True,
-                display_header_footer=False,
-                margin={'top': '10mm', 'bottom': '10mm', 'left': '10mm', 'right': '10mm'}
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        print(f'Jinja bytecode cache disabled: {e}')
+        return None
+    return FileSystemBytecodeCache(cache_dir)
+
+
+def get_environment(templates_dir, auto_reload=None):
+    # One Environment per templates directory so compiled templates stay in
+    # Jinja's in-memory cache across renders. Auto-reload costs one stat per
+    # get_template and recompiles only templates that changed.
+    if auto_reload is None:
+        auto_reload = _auto_reload_enabled()
+    key = (os.path.abspath(templates_dir), bool(auto_reload))
+    env = _ENVIRONMENTS.get(key)
+    if env is not None:
+        return env
+    with _ENVIRONMENTS_LOCK:
+        env = _ENVIRONMENTS.get(key)
+        if env is None:
+            env = Environment(
+                loader=FileSystemLoader(key[0]),
+                autoescape=select_autoescape(['html', 'xml']),
+                bytecode_cache=_bytecode_cache(),
+                auto_reload=key[1],
             )
-            browser.close()
-        print('Printed via Playwright')
-        return True
-    except Exception as e:
-        print(f'Playwright rendering failed: {e}')
-        return False
+            _ENVIRONMENTS[key] = env
+    return env
 
-async def _playwright_print_async(tmp_html, output_path):
-    if async_playwright is None:
-        return False
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(Path(tmp_html).resolve().as_uri(), wait_until='networkidle')
-            await page.emulate_media(media='print')
-            await page.pdf(
-                path=output_path,
-                format='A4',
-                print_background=True,
-                display_header_footer=False,
-                margin={'top': '10mm', 'bottom': '10mm', 'left': '10mm', 'right': '10mm'}
-            )
-            await browser.close()
-        return True
-    except Exception:
-        return False
 
+def precompile_templates(templates_dir, auto_reload=None):
+    env = get_environment(templates_dir, auto_reload=auto_reload)
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    return names
 
-def html_to_pdf(html_string, output_path, base_url=None, browser_path=None):
-    if HTML is not None:
-        try:
-            HTML(string=html_string, base_url=base_url).write_pdf(output_path)
-            return
-        except Exception as e:
-            print('WeasyPrint failed:', e)
 
-    fd, tmp_html = tempfile.mkstemp(suffix='.html')
-    os.close(fd)
-    with open(tmp_html, 'w', encoding='utf-8') as f:
-        f.write(html_string)
+def render_html(data, templates_dir, template_name='resume.html'):
+    with stage_timer('render'):
+        template = get_environment(templates_dir).get_template(template_name)
+        return template.render(data=data)
 
-    # Prefer Playwright if available (best at suppressing headers/footers)
-    if _playwright_print(tmp_html, output_path):
-        try:
-            os.remove(tmp_html)
-        except Exception:
-            pass
-        return
 
+def _cdp_print(html_string, bin_path):
+    try:
+        return get_cdp_session(bin_path).print_pdf(html_string)
+    except Exception as e:
+        print(f'CDP rendering via {bin_path} failed: {e}')
+        # the browser or its websocket may be wedged; start fresh next time
+        discard_cdp_session(bin_path)
+        return None
+
+
+_WEASYPRINT_EXECUTOR = None
+_WEASYPRINT_EXECUTOR_LOCK = threading.Lock()
+
+
+def _weasyprint_executor():
+    # WeasyPrint is CPU-bound and synchronous; cap how many renders run at once.
+    global _WEASYPRINT_EXECUTOR
+    with _WEASYPRINT_EXECUTOR_LOCK:
+        if _WEASYPRINT_EXECUTOR is None:
+            try:
+                workers = max(1, int(os.environ.get('RESUME_WEASYPRINT_WORKERS', '2')))
+            except ValueError:
+                workers = 2
+            _WEASYPRINT_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='weasyprint')
+        return _WEASYPRINT_EXECUTOR
+
+
+# Only plain <style> blocks are lifted out; anything with a media query or
+# other attributes stays in the document.
+_STYLE_BLOCK_RE = re.compile(r'<style(?:\s+type="text/css")?\s*>(.*?)</style>', re.S | re.I)
+_WEASYPRINT_LOCAL = threading.local()
+_WEASYPRINT_CSS_LIMIT = 64
+# WeasyPrint applies write_pdf(stylesheets=...) with *user* origin, not
+# author origin. A lifted <style> block only cascades the same way when no
+# other author CSS is left in the document and it has no rules whose result
+# depends on origin; anything else is rendered with its CSS left in place.
+_ORIGIN_SENSITIVE_CSS_RE = re.compile(r'!\s*important|@(?:import|layer|counter-style|font-face)\b', re.I)
+_AUTHOR_CSS_RE = re.compile(r'<style\b|<link\b[^>]*\bstylesheet\b', re.I)
+
+
+def _stylesheet_liftable(css_text, remaining_html):
+    return not _ORIGIN_SENSITIVE_CSS_RE.search(css_text) and not _AUTHOR_CSS_RE.search(remaining_html)
+
+
+def _weasyprint_cache_enabled():
+    return os.environ.get('RESUME_WEASYPRINT_CACHE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _weasyprint_resources():
+    # FontConfiguration wraps fontconfig/Pango state that is not documented as
+    # thread-safe, so each render thread keeps its own, along with the CSS
+    # parsed against it.
+    local = _WEASYPRINT_LOCAL
+    if getattr(local, 'font_config', None) is None:
+        local.font_config = optional_import('weasyprint.text.fonts', 'FontConfiguration')()
+        local.stylesheets = {}
+    return local
+
+
+def _weasyprint_document(html_string, base_url=None, cached=None):
+    # Laid-out WeasyPrint document; the cached and uncached paths must
+    # produce the same layout.
+    HTML = optional_import('weasyprint', 'HTML')
+    if HTML is None:
+        raise RuntimeError(_import_problem('weasyprint', 'HTML', 'WeasyPrint'))
+    if cached is None:
+        cached = _weasyprint_cache_enabled()
+    if not cached or optional_import('weasyprint.text.fonts', 'FontConfiguration') is None:
+        return HTML(string=html_string, base_url=base_url).render()
+
+    res = _weasyprint_resources()
+    stylesheets = []
+    blocks = _STYLE_BLOCK_RE.findall(html_string)
+    if blocks:
+        css_text = '\n'.join(blocks)
+        remaining = _STYLE_BLOCK_RE.sub('', html_string)
+        if _stylesheet_liftable(css_text, remaining):
+            # Templates keep all their CSS in one static <style> block, so the
+            # same template always hashes to the same parsed stylesheet.
+            key = (base_url, hashlib.blake2b(css_text.encode('utf-8'), digest_size=16).digest())
+            css = res.stylesheets.get(key)
+            if css is None:
+                if len(res.stylesheets) >= _WEASYPRINT_CSS_LIMIT:
+                    res.stylesheets.clear()
+                CSS = optional_import('weasyprint', 'CSS')
+                css = res.stylesheets[key] = CSS(string=css_text, base_url=base_url, font_config=res.font_config)
+            stylesheets.append(css)
+            html_string = remaining
+    # the font configuration is reused either way; it has no effect on the cascade
+    return HTML(string=html_string, base_url=base_url).render(stylesheets=stylesheets, font_config=res.font_config)
+
+
+def _weasyprint_pdf(html_string, base_url=None, cached=None):
+    return _weasyprint_document(html_string, base_url, cached).write_pdf()
+
+
+def _find_chrome_bins(browser_path=None):
     chrome_bins = []
     if browser_path:
         chrome_bins.append(browser_path)
@@ -242,94 +196,175 @@ def html_to_pdf(html_string, output_path, base_url=None, browser_path=None):
         for p in common:
             if p not in chrome_bins and os.path.exists(p):
                 chrome_bins.append(p)
+    return chrome_bins
 
-    if not chrome_bins:
-        os.remove(tmp_html)
-        raise RuntimeError('No PDF renderer available (WeasyPrint missing and no Chrome/Edge found). Use --html-only.')
 
-    file_uri = Path(tmp_html).resolve().as_uri()
-    for bin_path in chrome_bins:
-        if websocket is None:
-            continue
-        try:
-            ok = _cdp_print(file_uri, output_path, bin_path, tmp_html)
-            if ok:
-                try:
-                    os.remove(tmp_html)
-                except Exception:
-                    pass
-                return
-        except Exception:
-            continue
+@functools.lru_cache(maxsize=None)
+def _chrome_bins(browser_path=None):
+    return tuple(_find_chrome_bins(browser_path))
 
-    try:
-        os.remove(tmp_html)
-    except Exception:
-        pass
-    raise RuntimeError('Failed to render PDF without headers. Install Playwright browsers or enable WeasyPrint.')
 
-async def html_to_pdf_async(html_string, output_path, base_url=None):
-    if HTML is not None:
-        try:
-            HTML(string=html_string, base_url=base_url).write_pdf(output_path)
-            return
-        except Exception as e:
-            print('WeasyPrint failed:', e)
+def _import_problem(module, attr, label):
+    # None when the backend imports; otherwise whether it is missing or
+    # installed but broken (e.g. WeasyPrint without its native libraries)
+    if optional_import(module, attr) is not None:
+        return None
+    if not module_installed(module.split('.')[0]):
+        return f'{label} not installed'
+    return f'{label} failed to import: {import_error(module, attr)}'
 
-    fd, tmp_html = tempfile.mkstemp(suffix='.html')
-    os.close(fd)
-    with open(tmp_html, 'w', encoding='utf-8') as f:
-        f.write(html_string)
 
-    if await _playwright_print_async(tmp_html, output_path):
-        try:
-            os.remove(tmp_html)
-        except Exception:
-            pass
-        return
+def _probe_renderers(browser_path=None):
+    # Capability check, run once per browser path; this is where the backend
+    # libraries first get imported. Failures that only show up when rendering
+    # are handled by the circuit breakers.
+    if not cdp_available():
+        cdp = 'websocket-client not installed'
+    elif not _chrome_bins(browser_path):
+        cdp = 'No Chrome/Edge found'
+    else:
+        cdp = None
+    return {
+        'weasyprint': _import_problem('weasyprint', 'HTML', 'WeasyPrint'),
+        'playwright': _import_problem('playwright.sync_api', 'sync_playwright', 'Playwright'),
+        'cdp': cdp,
+    }
 
-    try:
-        os.remove(tmp_html)
-    except Exception:
-        pass
-    raise RuntimeError('Failed to render PDF without headers. Install Playwright browsers or enable WeasyPrint.')
 
+RENDERERS = RendererSelector(_probe_renderers)
 
-def write_html_file(html_string, output_path):
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_string)
 
+def set_renderer(choice):
+    RENDERERS.set_choice(choice)
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate a PDF (or HTML) resume from JSON using a template')
-    parser.add_argument('input', help='Path to JSON input file')
-    parser.add_argument('--output', '-o', default='resume.pdf', help='Output file path (PDF or HTML)')
-    parser.add_argument('--templates', '-t', default='templates', help='Templates directory')
-    parser.add_argument('--template', default='resume.html', help='Template file name (e.g., resume_smart.html)')
-    parser.add_argument('--html-only', action='store_true', help='Write HTML output instead of converting to PDF')
-    parser.add_argument('--browser', '-b', help='Path to Chrome/Edge executable to use as fallback renderer')
-    args = parser.parse_args()
 
-    data = load_json(args.input)
+def reprobe_renderers():
+    _chrome_bins.cache_clear()
+    RENDERERS.reprobe()
 
-    html = render_html(data, args.templates, args.template)
 
-    base_url = os.path.abspath(args.templates)
+def _render_cdp(html_string, browser_path=None):
+    for bin_path in _chrome_bins(browser_path):
+        pdf_bytes = _cdp_print(html_string, bin_path)
+        if pdf_bytes:
+            return pdf_bytes
+    raise RuntimeError('Failed to render PDF via Chrome DevTools')
 
-    if args.html_only:
-        out = args.output
-        if not out.lower().endswith('.html'):
-            out = os.path.splitext(out)[0] + '.html'
-        write_html_file(html, out)
-        print(f'Generated HTML: {out} (open in browser and print to PDF)')
-        return
 
-    html_to_pdf(html, args.output, base_url=base_url, browser_path=args.browser)
-    print(f'Generated PDF: {args.output}')
+_SYNC_RENDERERS = {
+    'weasyprint': lambda html, base_url, browser_path: _weasyprint_pdf(html, base_url),
+    'playwright': lambda html, base_url, browser_path: get_pool().render(html),
+    'cdp': lambda html, base_url, browser_path: _render_cdp(html, browser_path),
+}
 
 
-if __name__ == '__main__':
-    main()
+class PdfRenderError(RuntimeError):
+    # No backend produced a PDF. `reason` is one line per backend tried, joined
+    # with '; ', for callers that put their own prefix in front.
+    def __init__(self, reasons=()):
+        self.reason = '; '.join(reasons) or 'no PDF renderer succeeded'
+        super().__init__(f'Failed to render PDF: {self.reason}')
+
+
+def _candidates(browser_path, renderer):
+    try:
+        return RENDERERS.candidates(browser_path, renderer)
+    except RuntimeError as e:
+        raise PdfRenderError([first_line(e)]) from e
+
+
+def html_to_pdf_bytes(html_string, base_url=None, browser_path=None, renderer=None):
+    errors = []
+    with stage_timer('pdf'):
+        for name in _candidates(browser_path, renderer):
+            if not RENDERERS.begin(name):
+                continue
+            with backend_attempt(name) as attempt:
+                try:
+                    pdf_bytes = _SYNC_RENDERERS[name](html_string, base_url, browser_path)
+                except Exception as e:
+                    attempt.fail()
+                    RENDERERS.record(name, False, str(e))
+                    errors.append(f'{name}: {first_line(e)}')
+                    print(f'{name} rendering failed: {e}')
+                    continue
+                except BaseException:
+                    RENDERERS.abandon(name)
+                    raise
+            RENDERERS.record(name, True)
+            return pdf_bytes
+    raise PdfRenderError(errors)
+
+
+def html_to_pdf(html_string, output_path, base_url=None, browser_path=None, renderer=None):
+    pdf_bytes = html_to_pdf_bytes(html_string, base_url=base_url, browser_path=browser_path, renderer=renderer)
+    with open(output_path, 'wb') as outf:
+        outf.write(pdf_bytes)
+
+
+async def _render_async(name, html_string, base_url, browser_path):
+    if name == 'weasyprint':
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_weasyprint_executor(), _weasyprint_pdf, html_string, base_url)
+    if name == 'playwright':
+        return await get_async_renderer().render(html_string)
+    # the sync CDP session, kept off the event loop
+    return await asyncio.to_thread(_render_cdp, html_string, browser_path)
+
+
+async def html_to_pdf_bytes_async(html_string, base_url=None, browser_path=None, renderer=None):
+    if not RENDERERS.probed(browser_path):
+        await asyncio.to_thread(RENDERERS.capabilities, browser_path)
+    errors = []
+    with stage_timer('pdf'):
+        for name in _candidates(browser_path, renderer):
+            if not RENDERERS.begin(name):
+                continue
+            with backend_attempt(name) as attempt:
+                try:
+                    pdf_bytes = await _render_async(name, html_string, base_url, browser_path)
+                except Exception as e:
+                    attempt.fail()
+                    RENDERERS.record(name, False, str(e))
+                    errors.append(f'{name}: {first_line(e)}')
+                    print(f'{name} rendering failed: {e}')
+                    continue
+                except BaseException:
+                    RENDERERS.abandon(name)
+                    raise
+            RENDERERS.record(name, True)
+            return pdf_bytes
+    raise PdfRenderError(errors)
+
+
+async def probe_renderers_async(browser_path=None):
+    # Startup check for the API server: render a blank page with every
+    # backend that looks installed (or just the pinned one) and open the breaker of any that fails,
+    # so requests skip it until the cooldown instead of discovering it.
+    caps = await asyncio.to_thread(RENDERERS.capabilities, browser_path)
+    results = {}
+    for name, reason in caps.items():
+        if RENDERERS.choice not in ('auto', name):
+            continue
+        if reason:
+            results[name] = reason
+            continue
+        try:
+            await _render_async(name, '<!doctype html><html><body></body></html>', None, browser_path)
+        except Exception as e:
+            RENDERERS.breakers[name].trip(str(e))
+            results[name] = 'failed: ' + first_line(e)
+            print(f'PDF renderer {name} failed its startup probe: {e}')
+            continue
+        results[name] = 'ok'
+    return results
+
+
+async def html_to_pdf_async(html_string, output_path, base_url=None, browser_path=None, renderer=None):
+    pdf_bytes = await html_to_pdf_bytes_async(html_string, base_url=base_url, browser_path=browser_path, renderer=renderer)
+    with open(output_path, 'wb') as outf:
+        outf.write(pdf_bytes)
+
 
 def write_html_file(html_string, output_path):
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -337,6 +372,13 @@ def write_html_file(html_string, output_path):
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from batch_generate import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from bench import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description='Generate a PDF (or HTML) resume from JSON using a template')
     parser.add_argument('input', help='Path to JSON input file')
     parser.add_argument('--output', '-o', default='resume.pdf', help='Output file path (PDF or HTML)')
@@ -344,9 +386,12 @@ def main():
     parser.add_argument('--template', default='resume.html', help='Template file name (e.g., resume_smart.html)')
     parser.add_argument('--html-only', action='store_true', help='Write HTML output instead of converting to PDF')
     parser.add_argument('--browser', '-b', help='Path to Chrome/Edge executable to use as fallback renderer')
+    parser.add_argument('--renderer', choices=RENDERER_CHOICES, help='PDF backend to use (default: RESUME_PDF_RENDERER or auto)')
     args = parser.parse_args()
+    if args.renderer:
+        set_renderer(args.renderer)
 
-    data = load_json(args.input)
+    data = load_resume(args.input)
 
     # render HTML
     html = render_html(data, args.templates, args.template)
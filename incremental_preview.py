@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from generate_resume import render_html
+from parse_input_text import _parse_section, parse_sections, split_text
+from parser_grammar import DEFAULT_GRAMMAR
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _section_digest(section_lines):
+    return hashlib.blake2b('\n'.join(section_lines).encode('utf-8'), digest_size=16).digest()
+
+
+# Per-client preview state. Parsed sections are remembered by (section kind,
+# content hash), so an edit to one bullet only re-parses the section it is in.
+class PreviewSession:
+
+    def __init__(self, session_id):
+        self.id = session_id
+        self.touched = time.monotonic()
+        self._parsed = {}
+        self._last = None
+        self._lock = threading.Lock()
+
+    def render(self, text, template_name, templates_dir, defaults=None):
+        with self._lock:
+            self.touched = time.monotonic()
+            sections = split_text(text)
+            seen = {}
+            stats = {'sections': 0, 'reparsed': 0, 'rendered': False}
+
+            def parse_section(key, section_lines):
+                ck = (key, _section_digest(section_lines))
+                result = self._parsed.get(ck)
+                if result is None:
+                    result = _parse_section(key, section_lines, DEFAULT_GRAMMAR)
+                    stats['reparsed'] += 1
+                seen[ck] = result
+                stats['sections'] += 1
+                return result
+
+            data = parse_sections(sections, defaults=defaults, parse_section=parse_section)
+            # drop sections that are no longer in the text
+            self._parsed = seen
+
+            last = self._last
+            if last is not None and last[0] == template_name and last[1] == data.content_hash:
+                return last[2], stats
+            html = render_html(data, templates_dir, template_name)
+            stats['rendered'] = True
+            self._last = (template_name, data.content_hash, html)
+            return html, stats
+
+
+class PreviewSessions:
+
+    def __init__(self, max_sessions=None, idle_ttl=None):
+        self.max_sessions = max_sessions or _env_int('RESUME_PREVIEW_SESSIONS', 256)
+        self.idle_ttl = idle_ttl or _env_int('RESUME_PREVIEW_SESSION_TTL', 1800)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id=None):
+        # Only ids issued here are resumed; anything else (unknown, expired,
+        # from another worker, not a string) gets a fresh session and id.
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id) if isinstance(session_id, str) else None
+            if session is None:
+                session = PreviewSession(uuid.uuid4().hex)
+                self._sessions[session.id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session.id)
+            return session
+
+    def drop(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.touched >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+    def __len__(self):
+        return len(self._sessions)
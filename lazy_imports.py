@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Optional heavy dependencies (WeasyPrint, Playwright, websocket-client) are
+# imported on first use instead of at module import, so HTML-only code paths
+# and server boot do not pay for them. Each first import is timed.
+
+_MISSING = object()
+_CACHE = {}
+_LOCK = threading.RLock()
+IMPORT_TIMES = {}
+_ERRORS = {}
+
+
+def optional_import(module, attr=None):
+    # Returns the module (or one of its attributes), or None when it cannot be
+    # imported. Failures are cached too, so a broken install costs one try.
+    key = (module, attr)
+    value = _CACHE.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    with _LOCK:
+        value = _CACHE.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        start = time.perf_counter()
+        error = None
+        try:
+            value = importlib.import_module(module)
+            if attr:
+                value = getattr(value, attr)
+        except Exception as e:
+            value = None
+            error = f'{type(e).__name__}: {e}'.strip().splitlines()[0]
+            _ERRORS[key] = error
+        if module not in IMPORT_TIMES:
+            IMPORT_TIMES[module] = {'ms': round((time.perf_counter() - start) * 1000, 1), 'error': error}
+        _CACHE[key] = value
+        return value
+
+
+def module_installed(module):
+    # Cheap check that does not import anything
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_error(module, attr=None):
+    # Why optional_import(module, attr) returned None (first line of the error)
+    return _ERRORS.get((module, attr))
+
+
+def import_report():
+    return dict(IMPORT_TIMES)
+
+
+def measure_import(module, python=None):
+    # Cumulative import time per module (microseconds) for `import module` in a
+    # fresh interpreter, parsed from -X importtime.
+    proc = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{proc.stderr[-2000:]}')
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report import time of a module against a budget')
+    parser.add_argument('module', nargs='?', default='api_server', help='Module to import (default: api_server)')
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('RESUME_IMPORT_BUDGET_MS', 800)),
+                        help='Fail when the import takes longer than this (default: RESUME_IMPORT_BUDGET_MS or 800)')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh-interpreter runs; the fastest is reported')
+    args = parser.parse_args(argv)
+
+    runs = [measure_import(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda t: t.get(args.module, (0, 0))[1])
+    total_ms = best.get(args.module, (0, 0))[1] / 1000
+    print(f'import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)')
+    for name, (_, cumulative) in sorted(best.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+    heavy = [m for m in ('weasyprint', 'playwright', 'websocket') if m in best]
+    if heavy:
+        print('Optional backends imported eagerly: ' + ', '.join(heavy))
+    return 1 if total_ms > args.budget_ms else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
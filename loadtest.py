@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent
+ENDPOINTS = ('/api/generate', '/api/preview', '/api/coverletter')
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def load_payloads(path, endpoints):
+    # JSONL records: {"endpoint": "/api/preview", "payload": {...}} replays as
+    # recorded; {"text": ...} (optionally with template/defaults) is sent to
+    # every endpoint in `endpoints`. Without a file, inputdata.txt is used.
+    requests = []
+    if path:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if 'endpoint' in record:
+                    requests.append((record['endpoint'], record.get('payload') or {}))
+                elif isinstance(record.get('text'), str):
+                    requests.extend((ep, record) for ep in endpoints)
+                else:
+                    raise ValueError(f'{path}:{lineno}: expected "endpoint"/"payload" or "text"')
+    else:
+        text = (BASE_DIR / 'inputdata.txt').read_text(encoding='utf-8-sig')
+        templates = sorted(p.name for p in (BASE_DIR / 'templates').glob('*.html')) or [None]
+        for template in templates:
+            requests.extend((ep, {'text': text, 'template': template}) for ep in endpoints)
+    if not requests:
+        raise ValueError('No requests to replay')
+    return requests
+
+
+def scrape_metrics(base_url):
+    # {series: value} from the server's /metrics, histogram buckets dropped
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    try:
+        conn.request('GET', '/metrics')
+        resp = conn.getresponse()
+        body = resp.read().decode('utf-8')
+        if resp.status != 200:
+            return None
+    except OSError:
+        return None
+    finally:
+        conn.close()
+    series = {}
+    for line in body.splitlines():
+        if not line or line.startswith('#') or '_bucket{' in line:
+            continue
+        name, _, value = line.rpartition(' ')
+        try:
+            series[name] = float(value)
+        except ValueError:
+            pass
+    return series
+
+
+def server_usage(before, after, elapsed):
+    if before is None or after is None:
+        return None
+    out = {}
+    cpu = after.get('process_cpu_seconds_total', 0) - before.get('process_cpu_seconds_total', 0)
+    out['cpu_seconds'] = round(cpu, 3)
+    out['cpu_utilisation'] = round(cpu / elapsed, 3) if elapsed > 0 else None
+    for key in ('process_resident_memory_bytes', 'process_max_resident_memory_bytes', 'process_threads'):
+        if key in after:
+            out[key.replace('process_', '')] = int(after[key])
+    # counters that moved during the run: fallbacks, queue rejections, cache hits...
+    deltas = {}
+    for key, value in after.items():
+        if key.startswith('resume_'):
+            delta = value - before.get(key, 0)
+            if delta:
+                deltas[key] = round(delta, 3)
+    out['changed'] = deltas
+    return out
+
+
+class Runner:
+
+    def __init__(self, base_url, requests, concurrency, rate=None, duration=None, total=None, timeout=60):
+        self.base = urlsplit(base_url)
+        self.requests = requests
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.total = total
+        self.timeout = timeout
+        self.results = []
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def _next(self, start):
+        # Returns (index, scheduled send time) or None when the run is over.
+        # With a rate, send times are fixed in advance and latency is measured
+        # from them, so a stalled server shows up as latency, not as fewer
+        # requests sent.
+        i = next(self._counter)
+        if self.total is not None and i >= self.total:
+            return None
+        scheduled = start + i / self.rate if self.rate else time.perf_counter()
+        if self.duration is not None and scheduled - start >= self.duration:
+            return None
+        return i, scheduled
+
+    def _connect(self):
+        return http.client.HTTPConnection(self.base.hostname, self.base.port or 80, timeout=self.timeout)
+
+    def _worker(self, start):
+        conn = self._connect()
+        try:
+            while True:
+                job = self._next(start)
+                if job is None:
+                    return
+                i, scheduled = job
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                endpoint, payload = self.requests[i % len(self.requests)]
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                status, error, size = None, None, 0
+                try:
+                    conn.request('POST', endpoint, body=body, headers={'Content-Type': 'application/json'})
+                    resp = conn.getresponse()
+                    size = len(resp.read())
+                    status = resp.status
+                    if status >= 400:
+                        error = f'HTTP {status}'
+                except socket.timeout:
+                    error = 'timeout'
+                except (OSError, http.client.HTTPException) as e:
+                    error = type(e).__name__
+                if error and status is None:
+                    conn.close()
+                    conn = self._connect()
+                finished = time.perf_counter()
+                with self._lock:
+                    self.results.append((endpoint, finished - scheduled, status, error, size, finished))
+        finally:
+            conn.close()
+
+    def run(self):
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._worker, args=(start,), daemon=True) for _ in range(self.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    def latency(rows):
+        ms = [r[1] * 1000 for r in rows]
+        if not ms:
+            return {}
+        return {
+            'mean_ms': round(sum(ms) / len(ms), 1),
+            'p50_ms': round(_percentile(ms, 50), 1),
+            'p95_ms': round(_percentile(ms, 95), 1),
+            'p99_ms': round(_percentile(ms, 99), 1),
+            'max_ms': round(max(ms), 1),
+        }
+
+    ok = [r for r in results if r[3] is None]
+    errors = {}
+    for r in results:
+        if r[3] is not None:
+            errors[r[3]] = errors.get(r[3], 0) + 1
+    per_endpoint = {}
+    for endpoint in sorted({r[0] for r in results}):
+        rows = [r for r in results if r[0] == endpoint]
+        good = [r for r in rows if r[3] is None]
+        per_endpoint[endpoint] = {'requests': len(rows), 'ok': len(good), **latency(good)}
+    return {
+        'requests': len(results),
+        'ok': len(ok),
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'throughput_rps': round(len(ok) / elapsed, 2) if elapsed > 0 else None,
+        'latency': latency(ok),
+        'endpoints': per_endpoint,
+        'bytes_received': sum(r[4] for r in results),
+    }
+
+
+def _wait_ready(base_url, timeout):
+    # /api/ready answers 200 only once the background warm-up has finished,
+    # so the first measured requests do not pay for cold starts
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=2)
+        try:
+            conn.request('GET', '/api/ready')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        finally:
+            conn.close()
+        time.sleep(0.2)
+    return False
+
+
+def start_server(port, extra_env=None):
+    env = dict(os.environ, **(extra_env or {}))
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api_server:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=str(BASE_DIR), env=env,
+    )
+    if not _wait_ready(f'http://127.0.0.1:{port}', 60):
+        proc.terminate()
+        raise RuntimeError('api_server did not become ready within 60s')
+    return proc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded API payloads against api_server and report capacity')
+    parser.add_argument('payloads', nargs='?', help='JSONL of {"endpoint", "payload"} or {"text", ...} records (default: inputdata.txt with every template)')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+    parser.add_argument('--start-server', action='store_true', help='Start api_server on --url\'s port for the run and stop it afterwards')
+    parser.add_argument('--endpoint', action='append', choices=ENDPOINTS, help='Endpoints for {"text"} records; repeat for several (default: all three)')
+    parser.add_argument('--concurrency', '-c', type=int, default=4, help='Concurrent connections')
+    parser.add_argument('--rate', '-r', type=float, help='Requests per second across all connections (default: as fast as possible)')
+    parser.add_argument('--duration', '-d', type=float, help='Stop sending after this many seconds')
+    parser.add_argument('--requests', '-n', type=int, help='Total requests to send (default: one pass over the payloads unless --duration is set)')
+    parser.add_argument('--timeout', type=float, default=60, help='Per-request timeout in seconds')
+    parser.add_argument('--output', '-o', help='Write the JSON report here')
+    args = parser.parse_args(argv)
+
+    requests = load_payloads(args.payloads, args.endpoint or list(ENDPOINTS))
+    total = args.requests if args.requests is not None else (None if args.duration else len(requests))
+
+    proc = start_server(urlsplit(args.url).port or 8000) if args.start_server else None
+    try:
+        before = scrape_metrics(args.url)
+        runner = Runner(args.url, requests, args.concurrency, rate=args.rate, duration=args.duration,
+                        total=total, timeout=args.timeout)
+        elapsed = runner.run()
+        after = scrape_metrics(args.url)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    report = summarize(runner.results, elapsed)
+    report['config'] = {'url': args.url, 'concurrency': args.concurrency, 'rate': args.rate,
+                        'duration': args.duration, 'payloads': args.payloads or 'inputdata.txt'}
+    report['server'] = server_usage(before, after, elapsed)
+
+    lat = report['latency']
+    print(f"{report['ok']}/{report['requests']} ok in {report['seconds']}s, {report['throughput_rps']} req/s; "
+          f"p50 {lat.get('p50_ms')}ms p95 {lat.get('p95_ms')}ms p99 {lat.get('p99_ms')}ms", file=sys.stderr)
+    if report['errors']:
+        print('Errors: ' + ', '.join(f'{k} x{v}' for k, v in sorted(report['errors'].items())), file=sys.stderr)
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(out, encoding='utf-8')
+    else:
+        print(out)
+    return 1 if report['ok'] == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import bisect
+import contextvars
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Minimal Prometheus text-format metrics, enough for counters, gauges and
+# histograms without pulling in prometheus_client.
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _num(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f'{self.name}{_labels(self.labelnames, key)} {_num(value)}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # per-bucket (non-cumulative) counts, sum, count
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _render_value(self, key, value):
+        counts, total, count = value
+        lines = []
+        running = 0
+        for bound, n in zip(self.buckets + (float('inf'),), counts):
+            running += n
+            lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, ("le", _num(float(bound))))} {running}')
+        lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}')
+        lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+REGISTRY = []
+
+
+def _process_lines():
+    # The standard process_* series, from the stdlib only
+    samples = [('process_threads', 'gauge', 'Python threads in this process', threading.active_count())]
+    if resource is not None:
+        ru = resource.getrusage(resource.RUSAGE_SELF)
+        samples.append(('process_cpu_seconds_total', 'counter', 'User and system CPU time spent', round(ru.ru_utime + ru.ru_stime, 3)))
+        # ru_maxrss is bytes on macOS and kilobytes elsewhere
+        peak = ru.ru_maxrss if sys.platform == 'darwin' else ru.ru_maxrss * 1024
+        samples.append(('process_max_resident_memory_bytes', 'gauge', 'Peak resident memory', peak))
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        samples.append(('process_resident_memory_bytes', 'gauge', 'Resident memory', rss))
+    except (OSError, ValueError, AttributeError):
+        pass
+    lines = []
+    for name, kind, help_text, value in samples:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {_num(value)}']
+    return lines
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(_process_lines())
+    return '\n'.join(lines) + '\n'
+
+
+STAGE_SECONDS = Histogram('resume_stage_seconds', 'Time spent per pipeline stage', ('stage',))
+PDF_BACKEND_SECONDS = Histogram('resume_pdf_backend_seconds', 'Time spent per PDF backend attempt', ('backend', 'result'))
+PDF_BACKEND_TOTAL = Counter('resume_pdf_backend_attempts_total', 'PDF backend attempts; result="failed" means the next backend was tried', ('backend', 'result'))
+HTTP_SECONDS = Histogram('resume_http_request_seconds', 'HTTP request latency', ('route', 'method', 'status'))
+
+
+# Server-Timing collection: the HTTP middleware opens a list per request and
+# stage timers running in that request's context append to it. Tasks that
+# outlive the request (background job workers) inherit a closed list and
+# record nothing.
+class RequestTimings:
+    __slots__ = ('entries', 'closed')
+
+    def __init__(self):
+        self.entries = []
+        self.closed = False
+
+    def add(self, name, seconds):
+        if not self.closed:
+            self.entries.append((name, seconds))
+
+    def header(self, total=None):
+        parts = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.entries]
+        if total is not None:
+            parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
+
+
+_REQUEST_TIMINGS = contextvars.ContextVar('resume_request_timings', default=None)
+
+
+def begin_request():
+    timings = RequestTimings()
+    return timings, _REQUEST_TIMINGS.set(timings)
+
+
+def end_request(timings, token):
+    timings.closed = True
+    _REQUEST_TIMINGS.reset(token)
+
+
+def _record_timing(name, seconds):
+    timings = _REQUEST_TIMINGS.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        _record_timing(stage, elapsed)
+
+
+class _Attempt:
+    __slots__ = ('failed',)
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+@contextmanager
+def backend_attempt(backend):
+    # Records one try of a PDF backend. The block calls attempt.fail() when it
+    # falls through to the next backend; an exception also counts as failed.
+    attempt = _Attempt()
+    start = time.perf_counter()
+    try:
+        yield attempt
+    except BaseException:
+        attempt.failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        result = 'failed' if attempt.failed else 'ok'
+        PDF_BACKEND_SECONDS.observe(elapsed, backend=backend, result=result)
+        PDF_BACKEND_TOTAL.inc(backend=backend, result=result)
+        _record_timing(f'pdf-{backend}', elapsed)
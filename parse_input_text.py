@@ -1,47 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import argparse
+import io
 import json
-import re
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-SECTION_TITLES = {
-    'Профессиональный профиль': 'about me',
-    'ПРОФЕССИОНАЛЬНОЕ РЕЗЮМЕ': 'about me',
-    'ОБО МНЕ': 'about me',
-    'О себе': 'about me',
-    'Навыки': 'skills',
-    'Ключевые навыки': 'skills',
-    'КЛЮЧЕВЫЕ НАВЫКИ': 'skills',
-    'ТЕХНИЧЕСКИЕ НАВЫКИ': 'skills',
-    'Дополнительно': 'skills',
-    'ДОПОЛНИТЕЛЬНО': 'skills',
-    'Опыт работы': 'work experience',
-    'ОПЫТ РАБОТЫ': 'work experience',
-    'КОММЕРЧЕСКИЙ ОПЫТ': 'work experience',
-    'Образование': 'education',
-    'ОБРАЗОВАНИЕ': 'education',
-    'Сопроводительное письмо': 'cover letter',
-    'СОПРОВОДИТЕЛЬНОЕ ПИСЬМО': 'cover letter',
-    'Короткое сопроводительное письмо': 'cover letter'
-}
-
-KNOWN_COMPANIES = {
-    'SMARTER HOLDINGS INTERNATIONAL LTD',
-    'LANDINGDV',
-    'INSIDE 360',
-    'ООО «ДИАСОФТ»',
-    'ООО "ДИАСОФТ"',
-    'ДИАСОФТ',
-    'RETAILOS',
-    'TECHAHEADLAB',
-    'TECHAHEADLAB (USA)',
-    'TECHAHEADLAB USA'
-}
-
-
-def _norm_heading(s: str) -> str:
-    return re.sub(r'\s+', ' ', s.strip()).upper()
+from metrics import stage_timer
+# SECTION_TITLES and KNOWN_COMPANIES are re-exported (read-only) for existing
+# importers; extend them with DEFAULT_GRAMMAR.copy() and register_* instead.
+from parser_grammar import (  # noqa: F401
+    BULLET_MARKERS_RE,
+    DEFAULT_GRAMMAR,
+    KNOWN_COMPANIES,
+    SECTION_TITLES,
+    YEAR_RANGE_RE,
+    YEAR_RE,
+    ParserGrammar,
+    norm_heading as _norm_heading,
+    strip_bullet_prefix as _strip_bullet_prefix,
+)
+from resume_model import Resume
 
 
 def _normalize_lines(text: str):
@@ -50,17 +33,11 @@ def _normalize_lines(text: str):
     return lines
 
 
-def _strip_bullet_prefix(s: str) -> str:
-    if not s:
-        return s
-    return re.sub(r'^[\s\u2022\u2023\u25E6\-\*\u00B7]+', '', s).strip()
-
-
-def _split_sections(lines):
+def _split_sections(lines, grammar: ParserGrammar = DEFAULT_GRAMMAR):
     sections = {}
     current = None
     buf = []
-    heading_lookup = {_norm_heading(k): k for k in SECTION_TITLES.keys()}
+    heading_lookup = grammar.heading_lookup
     for line in lines:
         norm = _norm_heading(line)
         if norm in heading_lookup:
@@ -122,11 +99,11 @@ def _parse_education(section_lines):
     rest = buf[2:] if len(buf) > 2 else []
 
     period = ''
-    m = re.search(r'(\d{4})\s*[-–—]\s*(\d{4})', degree_line)
+    m = YEAR_RANGE_RE.search(degree_line)
     if m:
         period = f"{m.group(1)}-{m.group(2)}"
     else:
-        m = re.search(r'(\d{4})', degree_line)
+        m = YEAR_RE.search(degree_line)
         if m:
             period = m.group(1)
 
@@ -142,7 +119,62 @@ def _parse_education(section_lines):
     return entries
 
 
-def _parse_work_experience(section_lines):
+# Job header layouts, in the order they are tried at each line
+_START_COMPANY_ROLE_PERIOD = 'company/role|period'
+_START_COMPANY_DASH_ROLE = 'company — role/period'
+_START_COMPANY_PERIOD_ROLE = 'company/period/role'
+_START_COMPANY_ROLE_THEN_PERIOD = 'company/role/period'
+_START_ROLE_COMPANY_PERIOD = 'role/company/period'
+
+
+class _LineTags:
+    __slots__ = ('heading', 'bullet', 'tech', 'period', 'role_period', 'company', 'role', 'dash_company')
+
+
+def _tag_line(line: str, grammar: ParserGrammar) -> _LineTags:
+    tags = _LineTags()
+    tags.heading = grammar.is_heading(line)
+    tags.bullet = line.lstrip().startswith(('•', '-', '*'))
+    low = _strip_bullet_prefix(line).lower().strip()
+    tags.tech = low.startswith('технологии') or low.startswith('technologies')
+    tags.period = grammar.is_period(line)
+    tags.role_period = grammar.parse_role_period(line)
+    tags.company = grammar.is_company_line(line)
+    tags.role = grammar.looks_like_role_line(line)
+    # "Company — Role" header: only the part left of the dash must be a company
+    tags.dash_company = '—' in line and grammar.is_company_line(line.split('—', 1)[0].strip())
+    return tags
+
+
+def _job_start(tags, idx: int):
+    # Which job header layout (if any) starts at idx. Mirrors the lookahead
+    # rules of each layout but only reads precomputed tags.
+    n = len(tags)
+    t0 = tags[idx]
+    if t0.bullet or t0.tech:
+        return None
+    t1 = tags[idx + 1] if idx + 1 < n else None
+    t2 = tags[idx + 2] if idx + 2 < n else None
+    if t1 is None or t1.bullet or t1.heading:
+        return None
+    if not t0.heading:
+        if not t0.role and t1.role_period is not None:
+            return _START_COMPANY_ROLE_PERIOD
+        if t0.dash_company and t1.period:
+            return _START_COMPANY_DASH_ROLE
+    if t2 is None or t2.bullet or t2.heading:
+        return None
+    if t0.company and t1.role_period is None and t1.period and t2.role:
+        return _START_COMPANY_PERIOD_ROLE
+    if t2.role_period is None and t2.period:
+        if t1.role or t0.company:
+            return _START_COMPANY_ROLE_THEN_PERIOD
+        if not t0.heading and not t1.tech:
+            return _START_ROLE_COMPANY_PERIOD
+    return None
+
+
+def _parse_work_experience(section_lines, grammar: ParserGrammar = DEFAULT_GRAMMAR):
     # Heuristic parser for formats:
     # A) Role
     #    Company
@@ -151,145 +183,22 @@ def _parse_work_experience(section_lines):
     # B) Company — Role
     #    Period
     #    bullets...
+    # C) Company / Role | Period, Company / Period / Role, Company / Role / Period
+    #
+    # Every line is tagged once, then a single forward pass over the tags
+    # groups headers and bullets into jobs.
     lines = [l for l in section_lines if l.strip() != '']
-    jobs = []
-    months = r'(Январ|Феврал|Март|Апрел|Май|Июн|Июл|Август|Сентябр|Октябр|Ноябр|Декабр)'
-    period_re = re.compile(
-        rf'{months}.*\d{{4}}.*((по|—|–|-)\s*)?{months}.*\d{{4}}',
-        re.IGNORECASE
-    )
-    years_re = re.compile(r'\b\d{4}\s*(по|—|–|-)\s*\d{4}\b', re.IGNORECASE)
-
-    def is_company_line(line: str) -> bool:
-        norm = _norm_heading(line)
-        if norm in KNOWN_COMPANIES:
-            return True
-        if re.search(r'\b(LLC|LTD|INC|ООО|АО|ЗАО)\b', norm):
-            return True
-        return False
-
-    def is_tech_line(line: str) -> bool:
-        low = _strip_bullet_prefix(line).lower().strip()
-        return low.startswith('технологии') or low.startswith('technologies')
-
-    def is_bullet_line(line: str) -> bool:
-        return line.lstrip().startswith(('•', '-', '*'))
-
-    def is_period(line: str) -> bool:
-        return bool(period_re.search(line) or years_re.search(line))
-
-    def is_heading(line: str) -> bool:
-        return _norm_heading(line) in {_norm_heading(k) for k in SECTION_TITLES.keys()}
-
-    def looks_like_role_line(line: str) -> bool:
-        role_keywords = (
-            'developer', 'engineer', 'разработчик', 'инженер', 'frontend', 'backend',
-            'full-stack', 'fullstack', 'web', 'senior', 'lead', 'architect', 'архитектор'
-        )
-        low = line.lower()
-        return any(k in low for k in role_keywords)
-
-    def looks_like_job_start(idx: int) -> bool:
-        if idx + 2 >= len(lines):
-            return False
-        if is_heading(lines[idx]) or is_heading(lines[idx + 1]) or is_heading(lines[idx + 2]):
-            return False
-        if is_bullet_line(lines[idx]) or is_bullet_line(lines[idx + 1]) or is_bullet_line(lines[idx + 2]):
-            return False
-        if is_tech_line(lines[idx]) or is_tech_line(lines[idx + 1]):
-            return False
-        if parse_role_period(lines[idx + 2]) is not None:
-            return False
-        return is_period(lines[idx + 2])
-
-    def looks_like_job_start_alt(idx: int) -> bool:
-        if idx + 1 >= len(lines):
-            return False
-        if is_heading(lines[idx]) or is_heading(lines[idx + 1]):
-            return False
-        if is_bullet_line(lines[idx]) or is_bullet_line(lines[idx + 1]):
-            return False
-        if is_tech_line(lines[idx]):
-            return False
-        if '—' not in lines[idx]:
-            return False
-        if not is_period(lines[idx + 1]):
-            return False
-        # avoid treating bullet-like statements as job headers
-        left = lines[idx].split('—', 1)[0].strip()
-        if not is_company_line(left):
-            return False
-        return True
-
-    def looks_like_job_start_company_first(idx: int) -> bool:
-        if idx + 2 >= len(lines):
-            return False
-        if is_heading(lines[idx + 1]) or is_heading(lines[idx + 2]):
-            return False
-        if is_bullet_line(lines[idx]) or is_bullet_line(lines[idx + 1]) or is_bullet_line(lines[idx + 2]):
-            return False
-        if is_tech_line(lines[idx]):
-            return False
-        if parse_role_period(lines[idx + 2]) is not None:
-            return False
-        if not is_period(lines[idx + 2]):
-            return False
-        # company line can be any name if role line looks valid
-        if looks_like_role_line(lines[idx + 1]):
-            return True
-        return is_company_line(lines[idx])
-
-    def parse_role_period(line: str):
-        # formats like: "Senior Backend Developer | Июнь 2021 – Ноябрь 2025"
-        # or: "Senior Developer — 2018 – 2020"
-        if '|' in line:
-            left, right = [p.strip() for p in line.split('|', 1)]
-        elif '—' in line:
-            left, right = [p.strip() for p in line.split('—', 1)]
-        elif '-' in line and is_period(line):
-            # ambiguous; skip if no clear separator
-            return None
-        else:
-            return None
-        if not left or not right:
-            return None
-        if not is_period(right):
-            return None
-        return left, right
-
-    def looks_like_job_start_company_role_period(idx: int) -> bool:
-        if idx + 1 >= len(lines):
-            return False
-        if is_heading(lines[idx]) or is_heading(lines[idx + 1]):
-            return False
-        if is_bullet_line(lines[idx]) or is_bullet_line(lines[idx + 1]):
-            return False
-        if is_tech_line(lines[idx]):
-            return False
-        if looks_like_role_line(lines[idx]):
-            return False
-        return parse_role_period(lines[idx + 1]) is not None
-
-    def looks_like_job_start_company_period_role(idx: int) -> bool:
-        if idx + 2 >= len(lines):
-            return False
-        if is_heading(lines[idx + 1]) or is_heading(lines[idx + 2]):
-            return False
-        if is_bullet_line(lines[idx]) or is_bullet_line(lines[idx + 1]) or is_bullet_line(lines[idx + 2]):
-            return False
-        if is_tech_line(lines[idx]):
-            return False
-        if not is_company_line(lines[idx]):
-            return False
-        if parse_role_period(lines[idx + 1]) is not None:
-            return False
-        if not is_period(lines[idx + 1]):
-            return False
-        return looks_like_role_line(lines[idx + 2])
+    tags = [_tag_line(line, grammar) for line in lines]
+    starts = [_job_start(tags, idx) for idx in range(len(lines))]
+
+    def is_boundary(idx: int) -> bool:
+        return starts[idx] is not None or tags[idx].heading
 
+    jobs = []
     i = 0
     while i < len(lines):
-        if is_heading(lines[i]):
+        t = tags[i]
+        if t.heading:
             i += 1
             continue
         # Handle case where a period line appears alone followed by bullets
@@ -297,30 +206,26 @@ def _parse_work_experience(section_lines):
         # Январь 2011 – Август 2016
         # • did X
         # • did Y
-        if is_period(lines[i]) and parse_role_period(lines[i]) is None and i + 1 < len(lines) and lines[i + 1].lstrip().startswith(('•', '-', '*')):
+        if t.period and t.role_period is None and i + 1 < len(lines) and tags[i + 1].bullet:
             period = lines[i].strip()
             # Try to infer company/role from previous lines if available
             company = ''
             role = ''
             if i - 1 >= 0:
-                prev = lines[i - 1].strip()
-                if looks_like_role_line(prev):
-                    role = prev
-                    if i - 2 >= 0 and is_company_line(lines[i - 2]):
+                if tags[i - 1].role:
+                    role = lines[i - 1].strip()
+                    if i - 2 >= 0 and tags[i - 2].company:
                         company = lines[i - 2].strip()
-                elif is_company_line(prev):
-                    company = prev
-                    if i - 2 >= 0 and looks_like_role_line(lines[i - 2]):
+                elif tags[i - 1].company:
+                    company = lines[i - 1].strip()
+                    if i - 2 >= 0 and tags[i - 2].role:
                         role = lines[i - 2].strip()
 
             i += 1
             bullets = []
-            while i < len(lines):
-                if looks_like_job_start(i) or looks_like_job_start_alt(i) or looks_like_job_start_company_period_role(i) or looks_like_job_start_company_first(i) or looks_like_job_start_company_role_period(i) or is_heading(lines[i]):
-                    break
-                ln = lines[i].lstrip()
+            while i < len(lines) and not is_boundary(i):
                 # strip common bullet markers
-                ln = re.sub(r'^[\u2022\-\*\u2023\u25E6\s]+', '', ln).strip()
+                ln = BULLET_MARKERS_RE.sub('', lines[i].lstrip()).strip()
                 if ln:
                     bullets.append(ln)
                 i += 1
@@ -332,32 +237,31 @@ def _parse_work_experience(section_lines):
                 'experience': bullets
             })
             continue
-        if looks_like_job_start_company_role_period(i):
+
+        kind = starts[i]
+        if kind == _START_COMPANY_ROLE_PERIOD:
             company = lines[i].strip()
-            parsed = parse_role_period(lines[i + 1].strip())
+            parsed = grammar.parse_role_period(lines[i + 1].strip())
             role, period = parsed if parsed else ('', '')
             i += 2
-        elif looks_like_job_start_alt(i):
+        elif kind == _START_COMPANY_DASH_ROLE:
             comp_role = lines[i].strip()
             period = lines[i + 1].strip()
-            company = ''
-            role = ''
-            if '—' in comp_role:
-                parts = [p.strip() for p in comp_role.split('—', 1)]
-                company = parts[0]
-                role = parts[1] if len(parts) > 1 else ''
+            parts = [p.strip() for p in comp_role.split('—', 1)]
+            company = parts[0]
+            role = parts[1] if len(parts) > 1 else ''
             i += 2
-        elif looks_like_job_start_company_period_role(i):
+        elif kind == _START_COMPANY_PERIOD_ROLE:
             company = lines[i].strip()
             period = lines[i + 1].strip()
             role = lines[i + 2].strip()
             i += 3
-        elif looks_like_job_start_company_first(i):
+        elif kind == _START_COMPANY_ROLE_THEN_PERIOD:
             company = lines[i].strip()
             role = lines[i + 1].strip()
             period = lines[i + 2].strip()
             i += 3
-        elif looks_like_job_start(i):
+        elif kind == _START_ROLE_COMPANY_PERIOD:
             role = lines[i].strip()
             company = lines[i + 1].strip()
             period = lines[i + 2].strip()
@@ -367,11 +271,7 @@ def _parse_work_experience(section_lines):
             continue
 
         bullets = []
-        while i < len(lines):
-            if looks_like_job_start(i) or looks_like_job_start_alt(i) or looks_like_job_start_company_period_role(i) or looks_like_job_start_company_first(i) or looks_like_job_start_company_role_period(i):
-                break
-            if is_heading(lines[i]):
-                break
+        while i < len(lines) and not is_boundary(i):
             ln = _strip_bullet_prefix(lines[i])
             if ln:
                 bullets.append(ln)
@@ -424,9 +324,25 @@ def _resolve_education(defaults: dict) -> list:
     return [merged]
 
 
-def parse_text(text: str, defaults: dict | None = None):
-    lines = _normalize_lines(text)
-    sections = _split_sections(lines)
+def _parse_section(key: str, section_lines, grammar: ParserGrammar):
+    if key == 'work experience':
+        return _parse_work_experience(section_lines, grammar)
+    if key == 'skills':
+        return _parse_skills(section_lines)
+    return _parse_about(section_lines)
+
+
+def split_text(text: str, grammar: ParserGrammar | None = None) -> dict:
+    return _split_sections(_normalize_lines(text), grammar or DEFAULT_GRAMMAR)
+
+
+def parse_sections(sections: dict, defaults: dict | None = None, grammar: ParserGrammar | None = None, parse_section=None):
+    # parse_section(key, lines) lets callers memoise per-section results;
+    # whatever it returns must not be mutated here.
+    grammar = grammar or DEFAULT_GRAMMAR
+    if parse_section is None:
+        def parse_section(key, section_lines):
+            return _parse_section(key, section_lines, grammar)
 
     data = {
         'name': 'Игнатов Сергей Николаевич',
@@ -437,25 +353,15 @@ def parse_text(text: str, defaults: dict | None = None):
     _apply_defaults(data, defaults or {})
 
     # About sections
-    about = []
-    if 'ОБО МНЕ' in sections:
-        about.extend(_parse_about(sections['ОБО МНЕ']))
-    elif 'О себе' in sections:
-        about.extend(_parse_about(sections['О себе']))
-    elif 'Профессиональный профиль' in sections:
-        about.extend(_parse_about(sections['Профессиональный профиль']))
-    elif 'ПРОФЕССИОНАЛЬНОЕ РЕЗЮМЕ' in sections:
-        about.extend(_parse_about(sections['ПРОФЕССИОНАЛЬНОЕ РЕЗЮМЕ']))
+    about_lines = grammar.section(sections, 'about me')
+    about = parse_section('about me', about_lines) if about_lines is not None else []
     if about:
         data['about me'] = about
 
     # Work experience
-    if 'КОММЕРЧЕСКИЙ ОПЫТ' in sections:
-        data['work experience'] = _parse_work_experience(sections['КОММЕРЧЕСКИЙ ОПЫТ'])
-    elif 'Опыт работы' in sections:
-        data['work experience'] = _parse_work_experience(sections['Опыт работы'])
-    elif 'ОПЫТ РАБОТЫ' in sections:
-        data['work experience'] = _parse_work_experience(sections['ОПЫТ РАБОТЫ'])
+    work_lines = grammar.section(sections, 'work experience')
+    if work_lines is not None:
+        data['work experience'] = parse_section('work experience', work_lines)
 
     # Education
     # Use fixed education entry regardless of input text
@@ -463,48 +369,137 @@ def parse_text(text: str, defaults: dict | None = None):
 
     # Skills
     skills = []
-    if 'Навыки' in sections:
-        skills.extend(_parse_skills(sections['Навыки']))
-    if 'Ключевые навыки' in sections:
-        skills.extend(_parse_skills(sections['Ключевые навыки']))
-    if 'КЛЮЧЕВЫЕ НАВЫКИ' in sections:
-        skills.extend(_parse_skills(sections['КЛЮЧЕВЫЕ НАВЫКИ']))
-    if 'ТЕХНИЧЕСКИЕ НАВЫКИ' in sections:
-        skills.extend(_parse_skills(sections['ТЕХНИЧЕСКИЕ НАВЫКИ']))
-    if 'Дополнительно' in sections:
-        skills.extend(_parse_skills(sections['Дополнительно']))
-    if 'ДОПОЛНИТЕЛЬНО' in sections:
-        skills.extend(_parse_skills(sections['ДОПОЛНИТЕЛЬНО']))
+    for skill_lines in grammar.all_sections(sections, 'skills'):
+        skills.extend(parse_section('skills', skill_lines))
     if skills:
         data['skills'] = skills
 
     # Cover letter
-    if 'Сопроводительное письмо' in sections:
-        data['cover letter'] = _parse_about(sections['Сопроводительное письмо'])
-    elif 'СОПРОВОДИТЕЛЬНОЕ ПИСЬМО' in sections:
-        data['cover letter'] = _parse_about(sections['СОПРОВОДИТЕЛЬНОЕ ПИСЬМО'])
-    elif 'Короткое сопроводительное письмо' in sections:
-        data['cover letter'] = _parse_about(sections['Короткое сопроводительное письмо'])
+    letter_lines = grammar.section(sections, 'cover letter')
+    if letter_lines is not None:
+        data['cover letter'] = parse_section('cover letter', letter_lines)
 
     # Drop leading non-letterhead line if it looks like a preface
     if 'cover letter' in data and data['cover letter']:
         if data['cover letter'][0].lower().startswith('теперь подготовим'):
             data['cover letter'] = data['cover letter'][1:]
 
-    return data
+    return Resume(data)
+
 
+def parse_text(text: str, defaults: dict | None = None, grammar: ParserGrammar | None = None):
+    with stage_timer('parse'):
+        return parse_sections(split_text(text, grammar), defaults=defaults, grammar=grammar)
 
-def main():
+
+def _parse_record(lineno: int, line: str, field: str, id_field: str):
+    # Runs in a worker process: decode, parse and encode one JSONL record so
+    # the parent only moves strings around.
+    out = {'line': lineno}
+    try:
+        record = json.loads(line)
+        if isinstance(record, str):
+            text, defaults = record, None
+        elif isinstance(record, dict):
+            if id_field in record:
+                out['id'] = record[id_field]
+            text, defaults = record.get(field), record.get('defaults')
+        else:
+            raise ValueError('record must be a JSON string or object')
+        if not isinstance(text, str):
+            raise ValueError(f'missing text field {field!r}')
+        out['data'] = parse_text(text, defaults=defaults)
+    except Exception as e:
+        out['error'] = f'{type(e).__name__}: {e}'
+    return json.dumps(out, ensure_ascii=False), 'error' not in out
+
+
+def _parse_chunk(chunk, field, id_field):
+    return [_parse_record(lineno, line, field, id_field) for lineno, line in chunk]
+
+
+def _read_chunks(stream, size):
+    chunk = []
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        chunk.append((lineno, line))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_jsonl(stream, field='text', id_field='id', jobs=None, chunk_size=16):
+    # Yields (json_line, ok) per input record, in input order. At most
+    # 2 * jobs chunks are read ahead, so memory does not grow with the input.
+    chunks = _read_chunks(stream, chunk_size)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk, field, id_field)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk, field, id_field))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _stream_main(args):
+    if args.input == '-':
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig')
+    else:
+        source = open(args.input, 'r', encoding='utf-8-sig')
+    output = args.output or '-'
+    if output == '-':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sink = sys.stdout
+    else:
+        sink = open(output, 'w', encoding='utf-8')
+
+    total = errors = 0
+    start = time.perf_counter()
+    try:
+        for line, ok in parse_jsonl(source, field=args.field, id_field=args.id_field, jobs=args.jobs, chunk_size=args.chunk_size):
+            sink.write(line)
+            sink.write('\n')
+            total += 1
+            errors += not ok
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f'Parsed {total} records ({errors} errors) in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Parse resume text into sample_input.json format')
-    parser.add_argument('input', help='Path to input text file')
-    parser.add_argument('--output', '-o', default='sample_input.json', help='Output JSON path')
-    args = parser.parse_args()
+    parser.add_argument('input', help='Path to input text file, or a .jsonl dump (use - for JSONL on stdin)')
+    parser.add_argument('--output', '-o', help='Output JSON path (default: sample_input.json; stdout for JSONL)')
+    parser.add_argument('--jsonl', action='store_true', help='Treat input as JSONL: one resume text per line')
+    parser.add_argument('--field', default='text', help='JSONL field holding the resume text (default: text)')
+    parser.add_argument('--id-field', default='id', help='JSONL field copied to the output as "id" (default: id)')
+    parser.add_argument('--jobs', '-j', type=int, help='Worker processes for JSONL mode (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=16, help='Records sent to a worker at a time')
+    args = parser.parse_args(argv)
+
+    if args.jsonl or args.input == '-' or args.input.lower().endswith('.jsonl'):
+        _stream_main(args)
+        return
 
     text = Path(args.input).read_text(encoding='utf-8')
     data = parse_text(text)
 
-    Path(args.output).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
-    print(f'Wrote JSON: {args.output}')
+    output = args.output or 'sample_input.json'
+    Path(output).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'Wrote JSON: {output}')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import difflib
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+from parse_input_text import parse_text
+from resume_model import validate
+
+# Regression corpus for parse_input_text: synthetic resumes in every job
+# header layout the parser knows, from one job to thousands of lines.
+#   generate - write corpus/*.txt and their golden *.json outputs
+#   baseline - record parser throughput (lines/sec) per size on this machine
+#   check    - compare against the goldens, fuzz, and fail when throughput
+#              drops below the baseline or grows worse than linearly
+
+BASE_DIR = Path(__file__).resolve().parent
+CORPUS_DIR = BASE_DIR / 'corpus'
+BASELINE_PATH = CORPUS_DIR / 'baseline.json'
+
+LAYOUTS = ('role-company-period', 'company-role-period', 'company-period-role', 'company-dash-role', 'company-role-pipe')
+# (jobs, bullets per job); golden files are kept for the first three sizes,
+# the larger ones are generated on the fly for the throughput check
+SIZES = {
+    'tiny': (1, 2),
+    'small': (3, 5),
+    'medium': (12, 8),
+    'large': (60, 12),
+    'huge': (400, 15),
+}
+GOLDEN_SIZES = ('tiny', 'small', 'medium')
+SEED = 1729
+
+_COMPANIES = ('ООО Ромашка', 'АО Вектор', 'Northwind LLC', 'Globex INC', 'ЗАО Север', 'Initech LTD', 'ООО Техносфера', 'Umbrella LLC')
+_ROLES = ('Senior Backend Developer', 'Frontend Engineer', 'Full-stack разработчик', 'Lead Python Developer',
+          'Ведущий инженер', 'Web Developer', 'Архитектор решений', 'Backend Engineer')
+_MONTHS = ('Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь', 'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь')
+_VERBS = ('Разработал', 'Спроектировал', 'Оптимизировал', 'Внедрил', 'Поддерживал', 'Автоматизировал', 'Перевёл', 'Настроил')
+_OBJECTS = ('сервис платежей', 'REST API на FastAPI', 'очереди задач на Celery', 'кэширование в Redis', 'CI/CD в GitLab',
+            'мониторинг на Prometheus', 'миграцию на PostgreSQL 15', 'SPA на React и TypeScript', 'поиск на Elasticsearch')
+_RESULTS = ('сократив время ответа на 40%', 'для 2 млн пользователей', 'без простоя', 'уменьшив затраты на 25%', '', '')
+_SKILLS = ('Языки: Python, TypeScript, Go', 'Фреймворки: FastAPI, Django, React', 'Базы данных: PostgreSQL, Redis, ClickHouse',
+           'Инфраструктура: Docker, Kubernetes, Terraform', 'Инструменты: Git, Jira, Grafana', 'Английский язык (B2)')
+_MARKERS = ('• ', '- ', '* ', '• ')
+
+
+def _period(rng):
+    start = rng.randint(2005, 2022)
+    end = start + rng.randint(0, 3)
+    return f'{rng.choice(_MONTHS)} {start} – {rng.choice(_MONTHS)} {end}'
+
+
+def _job_header(layout, company, role, period):
+    if layout == 'role-company-period':
+        return [role, company, period]
+    if layout == 'company-role-period':
+        return [company, role, period]
+    if layout == 'company-period-role':
+        return [company, period, role]
+    if layout == 'company-dash-role':
+        return [f'{company} — {role}', period]
+    return [company, f'{role} | {period}']
+
+
+def synthetic_resume(layout, jobs, bullets, seed=SEED):
+    # layout None mixes all layouts, one per job
+    rng = random.Random(f'{seed}:{layout}:{jobs}:{bullets}')
+    out = ['Иванов Иван Иванович', 'ivanov@example.com', 'Москва, Россия', '@ivanov', '']
+    out += ['ОБО МНЕ', '', 'Backend-разработчик с опытом высоконагруженных сервисов.', 'Люблю измеримые результаты.', '']
+    out += ['КЛЮЧЕВЫЕ НАВЫКИ', '']
+    out += ['• ' + s for s in rng.sample(_SKILLS, min(len(_SKILLS), 2 + jobs % 5))]
+    out += ['', 'ОПЫТ РАБОТЫ', '']
+    for j in range(jobs):
+        job_layout = layout or LAYOUTS[j % len(LAYOUTS)]
+        out += _job_header(job_layout, rng.choice(_COMPANIES), rng.choice(_ROLES), _period(rng))
+        for _ in range(bullets):
+            text = f'{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_RESULTS)}'.strip()
+            out.append(rng.choice(_MARKERS) + text)
+        out.append('')
+    out += ['ОБРАЗОВАНИЕ', '', 'Бакалавр, 2010', 'МГТУ им. Баумана', '']
+    out += ['Сопроводительное письмо', '', 'Здравствуйте!', 'Хочу присоединиться к вашей команде.', '']
+    return '\n'.join(out)
+
+
+def corpus_cases():
+    # name -> (text, expected job count)
+    cases = {}
+    for size in GOLDEN_SIZES:
+        jobs, bullets = SIZES[size]
+        for layout in LAYOUTS:
+            cases[f'{layout}-{size}'] = (synthetic_resume(layout, jobs, bullets), jobs)
+        cases[f'mixed-{size}'] = (synthetic_resume(None, max(jobs, len(LAYOUTS)), bullets), max(jobs, len(LAYOUTS)))
+    cases['inputdata'] = ((BASE_DIR / 'inputdata.txt').read_text(encoding='utf-8-sig'), None)
+    return cases
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+
+def generate(corpus_dir=CORPUS_DIR):
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    problems = []
+    for name, (text, expected_jobs) in corpus_cases().items():
+        data = parse_text(text)
+        jobs = len(data.get('work experience') or [])
+        if expected_jobs is not None and jobs != expected_jobs:
+            problems.append(f'{name}: generated {expected_jobs} jobs, parser found {jobs}')
+        (corpus_dir / f'{name}.txt').write_text(text, encoding='utf-8')
+        (corpus_dir / f'{name}.json').write_text(_dump(data), encoding='utf-8')
+    return problems
+
+
+def check_goldens(corpus_dir=CORPUS_DIR):
+    failures = []
+    inputs = sorted(corpus_dir.glob('*.txt'))
+    if not inputs:
+        return [f'no corpus in {corpus_dir}; run "python parser_corpus.py generate"']
+    for path in inputs:
+        golden = path.with_suffix('.json')
+        if not golden.exists():
+            failures.append(f'{path.name}: missing {golden.name}')
+            continue
+        actual = _dump(parse_text(path.read_text(encoding='utf-8')))
+        expected = golden.read_text(encoding='utf-8')
+        if actual != expected:
+            diff = difflib.unified_diff(expected.splitlines(), actual.splitlines(), golden.name, 'parsed', lineterm='', n=2)
+            failures.append(f'{path.name}: output differs from golden\n' + '\n'.join(list(diff)[:40]))
+    return failures
+
+
+def _mutate(rng, text):
+    lines = text.split('\n')
+    for _ in range(rng.randint(1, 8)):
+        if not lines:
+            break
+        i = rng.randrange(len(lines))
+        op = rng.randrange(8)
+        if op == 0:
+            lines.insert(i, '')
+        elif op == 1:
+            del lines[i]
+        elif op == 2:
+            lines.insert(i, lines[i])
+        elif op == 3:
+            lines[i] = '   ' + lines[i] + '\t '
+        elif op == 4:
+            lines[i] = lines[i].lstrip('•-* ')
+        elif op == 5:
+            lines[i] = lines[i].replace('–', '—').replace('|', '—')
+        elif op == 6:
+            lines.insert(i, rng.choice(('ОПЫТ РАБОТЫ', 'Навыки', 'о себе', 'ОБРАЗОВАНИЕ', 'Образование')))
+        else:
+            lines[i] = lines[i][:rng.randrange(len(lines[i]) + 1)]
+    return rng.choice(('\n', '\r\n')).join(lines)
+
+
+def fuzz(iterations, seed=SEED):
+    # The parser must not raise, must return well-formed data and must give
+    # the same answer twice for arbitrarily mangled input.
+    rng = random.Random(seed)
+    sources = [text for text, _ in corpus_cases().values()]
+    failures = []
+    for n in range(iterations):
+        text = _mutate(rng, rng.choice(sources))
+        try:
+            data = parse_text(text)
+            validate(data)
+            if parse_text(text) != data:
+                raise AssertionError('non-deterministic output')
+        except Exception as e:
+            failures.append(f'fuzz case {n}: {type(e).__name__}: {e}')
+            if len(failures) >= 5:
+                break
+    return failures
+
+
+def measure(sizes=tuple(SIZES), repeat=5, min_seconds=0.2):
+    # lines/sec per size, best of `repeat` rounds of at least `min_seconds`
+    rates = {}
+    for size in sizes:
+        jobs, bullets = SIZES[size]
+        text = synthetic_resume(None, max(jobs, 1), bullets)
+        lines = text.count('\n') + 1
+        best = 0.0
+        for _ in range(repeat):
+            loops = 0
+            start = time.perf_counter()
+            while True:
+                parse_text(text)
+                loops += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_seconds:
+                    break
+            best = max(best, lines * loops / elapsed)
+        rates[size] = {'lines': lines, 'lines_per_sec': round(best)}
+    return rates
+
+
+def check_throughput(rates, baseline, tolerance, max_slowdown):
+    failures = []
+    for size, measured in rates.items():
+        recorded = (baseline or {}).get('rates', {}).get(size)
+        if recorded is None:
+            continue
+        floor = recorded['lines_per_sec'] * (1 - tolerance)
+        if measured['lines_per_sec'] < floor:
+            failures.append(f'{size}: {measured["lines_per_sec"]} lines/s is below the baseline '
+                            f'{recorded["lines_per_sec"]} lines/s (-{tolerance:.0%} allowed)')
+    # machine independent: cost per line must not grow with input size
+    # (medium is the smallest size where job lines outweigh the fixed sections)
+    smallest, largest = rates.get('medium'), rates.get('huge')
+    if smallest and largest:
+        slowdown = smallest['lines_per_sec'] / max(1, largest['lines_per_sec'])
+        if slowdown > max_slowdown:
+            failures.append(f'huge input parses {slowdown:.1f}x slower per line than medium (limit {max_slowdown}x): '
+                            'something in the parser is worse than linear')
+    return failures
+
+
+def _load_baseline(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Golden, fuzz and throughput checks for parse_input_text')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('generate', help='Write the corpus and golden outputs')
+    base = sub.add_parser('baseline', help='Record throughput on this machine')
+    check = sub.add_parser('check', help='Run golden, fuzz and throughput checks')
+    for p in (base, check):
+        p.add_argument('--baseline', default=os.environ.get('RESUME_PARSER_BASELINE') or str(BASELINE_PATH),
+                       help='Baseline JSON file (default: RESUME_PARSER_BASELINE or corpus/baseline.json)')
+        p.add_argument('--repeat', type=int, default=5, help='Timing rounds per size; the best is used')
+    check.add_argument('--tolerance', type=float, default=float(os.environ.get('RESUME_PARSER_TOLERANCE', 0.25)),
+                       help='Allowed throughput drop below the baseline (default: RESUME_PARSER_TOLERANCE or 0.25)')
+    check.add_argument('--max-slowdown', type=float, default=2.0,
+                       help='Allowed per-line slowdown of the huge input vs the medium one (default 2.0)')
+    check.add_argument('--fuzz', type=int, default=300, help='Fuzz iterations (default 300, 0 to skip)')
+    check.add_argument('--no-throughput', action='store_true', help='Only check goldens and fuzz')
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        problems = generate()
+        print(f'Wrote {len(corpus_cases())} cases to {CORPUS_DIR}')
+        for p in problems:
+            print(f'warning: {p}', file=sys.stderr)
+        return 0
+
+    if args.command == 'baseline':
+        rates = measure(repeat=args.repeat)
+        baseline = {'python': platform.python_version(), 'machine': platform.machine(), 'rates': rates}
+        Path(args.baseline).write_text(json.dumps(baseline, indent=2) + '\n', encoding='utf-8')
+        for size, r in rates.items():
+            print(f'{size:>7}: {r["lines"]:6} lines  {r["lines_per_sec"]:>9} lines/s')
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    failures = check_goldens()
+    print(f'goldens: {len(failures)} failing')
+    if args.fuzz:
+        fuzz_failures = fuzz(args.fuzz)
+        print(f'fuzz: {args.fuzz} cases, {len(fuzz_failures)} failing')
+        failures += fuzz_failures
+    if not args.no_throughput:
+        baseline = _load_baseline(args.baseline)
+        if baseline is None:
+            print(f'No baseline at {args.baseline}; run "python parser_corpus.py baseline" to record one', file=sys.stderr)
+        rates = measure(repeat=args.repeat)
+        for size, r in rates.items():
+            recorded = ((baseline or {}).get('rates', {}).get(size) or {}).get('lines_per_sec')
+            print(f'{size:>7}: {r["lines"]:6} lines  {r["lines_per_sec"]:>9} lines/s'
+                  + (f'  (baseline {recorded})' if recorded else ''))
+        failures += check_throughput(rates, baseline, args.tolerance, args.max_slowdown)
+    for f in failures:
+        print(f'FAIL {f}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import re
+from types import MappingProxyType
+
+# The default tables are read-only: DEFAULT_GRAMMAR copies them when it is
+# built, so changing them afterwards would have no effect. Extend a grammar
+# with ParserGrammar.register_* instead.
+SECTION_TITLES = MappingProxyType({
+    'Профессиональный профиль': 'about me',
+    'ПРОФЕССИОНАЛЬНОЕ РЕЗЮМЕ': 'about me',
+    'ОБО МНЕ': 'about me',
+    'О себе': 'about me',
+    'Навыки': 'skills',
+    'Ключевые навыки': 'skills',
+    'КЛЮЧЕВЫЕ НАВЫКИ': 'skills',
+    'ТЕХНИЧЕСКИЕ НАВЫКИ': 'skills',
+    'Дополнительно': 'skills',
+    'ДОПОЛНИТЕЛЬНО': 'skills',
+    'Опыт работы': 'work experience',
+    'ОПЫТ РАБОТЫ': 'work experience',
+    'КОММЕРЧЕСКИЙ ОПЫТ': 'work experience',
+    'Образование': 'education',
+    'ОБРАЗОВАНИЕ': 'education',
+    'Сопроводительное письмо': 'cover letter',
+    'СОПРОВОДИТЕЛЬНОЕ ПИСЬМО': 'cover letter',
+    'Короткое сопроводительное письмо': 'cover letter'
+})
+
+# Which heading wins when a text contains several aliases of one section.
+# 'skills' is the exception: every listed skills section is concatenated.
+SECTION_PRECEDENCE = {
+    'about me': ['ОБО МНЕ', 'О себе', 'Профессиональный профиль', 'ПРОФЕССИОНАЛЬНОЕ РЕЗЮМЕ'],
+    'work experience': ['КОММЕРЧЕСКИЙ ОПЫТ', 'Опыт работы', 'ОПЫТ РАБОТЫ'],
+    'skills': ['Навыки', 'Ключевые навыки', 'КЛЮЧЕВЫЕ НАВЫКИ', 'ТЕХНИЧЕСКИЕ НАВЫКИ', 'Дополнительно', 'ДОПОЛНИТЕЛЬНО'],
+    'education': ['Образование', 'ОБРАЗОВАНИЕ'],
+    'cover letter': ['Сопроводительное письмо', 'СОПРОВОДИТЕЛЬНОЕ ПИСЬМО', 'Короткое сопроводительное письмо'],
+}
+
+KNOWN_COMPANIES = frozenset({
+    'SMARTER HOLDINGS INTERNATIONAL LTD',
+    'LANDINGDV',
+    'INSIDE 360',
+    'ООО «ДИАСОФТ»',
+    'ООО "ДИАСОФТ"',
+    'ДИАСОФТ',
+    'RETAILOS',
+    'TECHAHEADLAB',
+    'TECHAHEADLAB (USA)',
+    'TECHAHEADLAB USA'
+})
+
+MONTH_STEMS = ('Январ', 'Феврал', 'Март', 'Апрел', 'Май', 'Июн', 'Июл', 'Август', 'Сентябр', 'Октябр', 'Ноябр', 'Декабр')
+
+ROLE_KEYWORDS = (
+    'developer', 'engineer', 'разработчик', 'инженер', 'frontend', 'backend',
+    'full-stack', 'fullstack', 'web', 'senior', 'lead', 'architect', 'архитектор'
+)
+
+LEGAL_ENTITY_SUFFIXES = ('LLC', 'LTD', 'INC', 'ООО', 'АО', 'ЗАО')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_BULLET_PREFIX_RE = re.compile(r'^[\s\u2022\u2023\u25E6\-\*\u00B7]+')
+BULLET_MARKERS_RE = re.compile(r'^[\u2022\-\*\u2023\u25E6\s]+')
+YEAR_RANGE_RE = re.compile(r'(\d{4})\s*[-–—]\s*(\d{4})')
+YEAR_RE = re.compile(r'(\d{4})')
+_YEARS_PERIOD_RE = re.compile(r'\b\d{4}\s*(по|—|–|-)\s*\d{4}\b', re.IGNORECASE)
+
+
+def norm_heading(s: str) -> str:
+    return _WHITESPACE_RE.sub(' ', s.strip()).upper()
+
+
+def strip_bullet_prefix(s: str) -> str:
+    if not s:
+        return s
+    return _BULLET_PREFIX_RE.sub('', s).strip()
+
+
+class ParserGrammar:
+
+    def __init__(self, section_titles=None, section_precedence=None, companies=None,
+                 role_keywords=None, month_stems=None, legal_suffixes=None):
+        self.section_titles = dict(SECTION_TITLES if section_titles is None else section_titles)
+        source = SECTION_PRECEDENCE if section_precedence is None else section_precedence
+        self.section_precedence = {k: list(v) for k, v in source.items()}
+        self.companies = {norm_heading(c) for c in (KNOWN_COMPANIES if companies is None else companies)}
+        self.role_keywords = tuple(ROLE_KEYWORDS if role_keywords is None else role_keywords)
+        self.month_stems = tuple(MONTH_STEMS if month_stems is None else month_stems)
+        self.legal_suffixes = tuple(LEGAL_ENTITY_SUFFIXES if legal_suffixes is None else legal_suffixes)
+        self._compile()
+
+    def _compile(self):
+        # Later titles win when two aliases normalise to the same heading.
+        self.heading_lookup = {norm_heading(k): k for k in self.section_titles}
+        self.headings = frozenset(self.heading_lookup)
+        months = '(' + '|'.join(re.escape(m) for m in self.month_stems) + ')'
+        self.period_re = re.compile(
+            rf'{months}.*\d{{4}}.*((по|—|–|-)\s*)?{months}.*\d{{4}}',
+            re.IGNORECASE
+        )
+        self.legal_entity_re = re.compile(r'\b(' + '|'.join(re.escape(s) for s in self.legal_suffixes) + r')\b')
+
+    def copy(self):
+        return ParserGrammar(
+            section_titles=self.section_titles,
+            section_precedence=self.section_precedence,
+            companies=self.companies,
+            role_keywords=self.role_keywords,
+            month_stems=self.month_stems,
+            legal_suffixes=self.legal_suffixes,
+        )
+
+    def register_section_alias(self, title: str, key: str) -> None:
+        self.section_titles[title] = key
+        order = self.section_precedence.setdefault(key, [])
+        if title not in order:
+            order.append(title)
+        self._compile()
+
+    def register_company(self, name: str) -> None:
+        self.companies.add(norm_heading(name))
+
+    def register_role_keyword(self, keyword: str) -> None:
+        keyword = keyword.lower()
+        if keyword not in self.role_keywords:
+            self.role_keywords += (keyword,)
+
+    def section(self, sections: dict, key: str):
+        for title in self.section_precedence.get(key, ()):
+            if title in sections:
+                return sections[title]
+        return None
+
+    def all_sections(self, sections: dict, key: str):
+        return [sections[t] for t in self.section_precedence.get(key, ()) if t in sections]
+
+    def is_heading(self, line: str) -> bool:
+        return norm_heading(line) in self.headings
+
+    def is_period(self, line: str) -> bool:
+        return bool(self.period_re.search(line) or _YEARS_PERIOD_RE.search(line))
+
+    def is_company_line(self, line: str) -> bool:
+        norm = norm_heading(line)
+        if norm in self.companies:
+            return True
+        return bool(self.legal_entity_re.search(norm))
+
+    def looks_like_role_line(self, line: str) -> bool:
+        low = line.lower()
+        return any(k in low for k in self.role_keywords)
+
+    def parse_role_period(self, line: str):
+        # formats like: "Senior Backend Developer | Июнь 2021 – Ноябрь 2025"
+        # or: "Senior Developer — 2018 – 2020"
+        if '|' in line:
+            left, right = [p.strip() for p in line.split('|', 1)]
+        elif '—' in line:
+            left, right = [p.strip() for p in line.split('—', 1)]
+        else:
+            return None
+        if not left or not right:
+            return None
+        if not self.is_period(right):
+            return None
+        return left, right
+
+
+DEFAULT_GRAMMAR = ParserGrammar()
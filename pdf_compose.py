@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import io
+from functools import lru_cache
+from pathlib import Path
+
+from lazy_imports import optional_import
+from render_cache import cache_key, template_fingerprint
+from resume_model import Resume
+
+# A resume + cover letter bundle is assembled from two separately cached PDF
+# fragments, so tailoring the letter for another application re-renders one
+# page instead of the whole document.
+
+LETTER_KEY = 'cover letter'
+LETTER_TEMPLATE = 'fragments/cover_letter.html'
+# fields the letter page shows besides the letter itself
+LETTER_FIELDS = ('name', 'email', 'address', 'telegram_address', LETTER_KEY)
+ORDERS = ('resume-first', 'letter-first')
+
+
+@lru_cache(maxsize=64)
+def _uses_letter(path, fingerprint):
+    try:
+        return LETTER_KEY in Path(path).read_text(encoding='utf-8')
+    except OSError:
+        return True
+
+
+def resume_data(data, templates_dir, template_name):
+    # The letter is left out of the resume fragment's key unless the template
+    # actually renders it, so editing the letter keeps the resume cached.
+    path = Path(templates_dir) / template_name
+    if LETTER_KEY not in data or _uses_letter(str(path), template_fingerprint(templates_dir, template_name)):
+        return data
+    if isinstance(data, Resume):
+        return data.without(LETTER_KEY)
+    return {k: v for k, v in data.items() if k != LETTER_KEY}
+
+
+def resume_key(data, templates_dir, template_name):
+    return cache_key('pdf', resume_data(data, templates_dir, template_name), templates_dir, template_name)
+
+
+def letter_data(data):
+    if isinstance(data, Resume):
+        return data.subset(LETTER_FIELDS)
+    return {k: data[k] for k in LETTER_FIELDS if k in data}
+
+
+def letter_key(data, templates_dir):
+    return cache_key('pdf', letter_data(data), templates_dir, LETTER_TEMPLATE)
+
+
+def has_letter(data):
+    return any(str(p).strip() for p in data.get(LETTER_KEY) or [])
+
+
+def merge_pdfs(fragments):
+    # Concatenates already rendered PDFs page by page; nothing is re-laid out.
+    PdfWriter = optional_import('pypdf', 'PdfWriter')
+    if PdfWriter is None:
+        raise RuntimeError('pypdf is not installed: pip install pypdf')
+    writer = PdfWriter()
+    for pdf_bytes in fragments:
+        writer.append(io.BytesIO(pdf_bytes))
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import atexit
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+
+from lazy_imports import module_installed, optional_import
+
+
+PDF_OPTIONS = {
+    'format': 'A4',
+    'print_background': True,
+    'display_header_footer': False,
+    'margin': {'top': '10mm', 'bottom': '10mm', 'left': '10mm', 'right': '10mm'},
+}
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+# The sync Playwright API is bound to the thread that started it, so every
+# pool slot is a worker thread owning one warm browser and one context/page.
+# Jobs go to whichever worker is free through a shared queue.
+class PlaywrightPool:
+
+    def __init__(self, size=None, max_uses=None, render_timeout=None):
+        self.size = size or _env_int('RESUME_PDF_POOL_SIZE', 2)
+        self.max_uses = max_uses or _env_int('RESUME_PDF_POOL_MAX_USES', 200)
+        self.render_timeout = render_timeout or _env_int('RESUME_PDF_RENDER_TIMEOUT', 30)
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._slots = []
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            if self._threads or self._closed:
+                return
+            for idx in range(self.size):
+                slot = {
+                    'id': idx,
+                    'state': 'starting',
+                    'renders': 0,
+                    'page_uses': 0,
+                    'recycles': 0,
+                    'launches': 0,
+                    'errors': 0,
+                    'last_error': None,
+                    'last_render_ms': None,
+                }
+                t = threading.Thread(target=self._worker, args=(slot,), name=f'playwright-pool-{idx}', daemon=True)
+                self._slots.append(slot)
+                self._threads.append(t)
+                t.start()
+
+    def alive(self):
+        return sum(1 for s in self._slots if s['state'] not in ('dead', 'stopped'))
+
+    def render(self, html_string):
+        if optional_import('playwright.sync_api', 'sync_playwright') is None:
+            raise RuntimeError('Playwright not available')
+        if self._closed:
+            raise RuntimeError('Playwright pool is closed')
+        self.start()
+        if not self.alive():
+            raise RuntimeError('No live Playwright workers')
+        fut = Future()
+        self._jobs.put((html_string, fut))
+        return fut.result(timeout=self.render_timeout)
+
+    def health(self):
+        slots = [dict(s) for s in self._slots]
+        return {
+            'available': module_installed('playwright'),
+            'size': self.size,
+            'alive': self.alive(),
+            'idle': sum(1 for s in slots if s['state'] == 'idle'),
+            'queued': self._jobs.qsize(),
+            'max_uses': self.max_uses,
+            'workers': slots,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._jobs.put(None)
+        for t in threads:
+            t.join(timeout=5)
+
+    def _worker(self, slot):
+        try:
+            with optional_import('playwright.sync_api', 'sync_playwright')() as p:
+                self._serve(p, slot)
+            slot['state'] = 'stopped'
+        except Exception as e:
+            slot['state'] = 'dead'
+            slot['last_error'] = str(e)
+            self._fail_pending(e)
+
+    def _serve(self, p, slot):
+        browser = None
+        context = None
+        page = None
+        slot['state'] = 'idle'
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            html_string, fut = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            slot['state'] = 'busy'
+            start = time.perf_counter()
+            try:
+                if browser is None or not browser.is_connected():
+                    browser = p.chromium.launch(headless=True)
+                    slot['launches'] += 1
+                    page = None
+                if page is None or page.is_closed():
+                    context = browser.new_context()
+                    page = context.new_page()
+                    page.emulate_media(media='print')
+                    slot['page_uses'] = 0
+                page.set_content(html_string, wait_until='load')
+                pdf_bytes = page.pdf(**PDF_OPTIONS)
+            except Exception as e:
+                slot['errors'] += 1
+                slot['last_error'] = str(e)
+                # A failed render may leave the page (or the whole browser) in
+                # a bad state; drop it so the next job starts from scratch.
+                context, page = self._recycle(context, slot)
+                if browser is not None and not browser.is_connected():
+                    browser = None
+                fut.set_exception(e)
+            else:
+                slot['renders'] += 1
+                slot['page_uses'] += 1
+                slot['last_render_ms'] = round((time.perf_counter() - start) * 1000, 1)
+                fut.set_result(pdf_bytes)
+                if slot['page_uses'] >= self.max_uses:
+                    context, page = self._recycle(context, slot)
+            slot['state'] = 'idle'
+        self._recycle(context, slot)
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception:
+                pass
+
+    def _recycle(self, context, slot):
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+            slot['recycles'] += 1
+        return None, None
+
+    def _fail_pending(self, exc):
+        # Only the last worker standing drains the queue; others may still serve it.
+        if self.alive():
+            return
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None and job[1].set_running_or_notify_cancel():
+                job[1].set_exception(exc)
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = PlaywrightPool()
+            atexit.register(_POOL.close)
+        return _POOL
+
+
+def shutdown_pool():
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+# Async counterpart for the API server: one browser shared by every request
+# on the event loop, with at most `concurrency` pages rendering at once. Idle
+# pages are kept for reuse and recycled like the sync pool's.
+class AsyncPlaywrightRenderer:
+
+    def __init__(self, concurrency=None, max_uses=None, render_timeout=None):
+        self.concurrency = concurrency or _env_int('RESUME_RENDER_CONCURRENCY', 4)
+        self.max_uses = max_uses or _env_int('RESUME_PDF_POOL_MAX_USES', 200)
+        self.render_timeout = render_timeout or _env_int('RESUME_PDF_RENDER_TIMEOUT', 30)
+        self.loop = None
+        self.renders = 0
+        self.errors = 0
+        self.launches = 0
+        self.recycles = 0
+        self.last_error = None
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._start_lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+        self._in_use = 0
+
+    async def _ensure_browser(self):
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._playwright is None:
+                self._playwright = await optional_import('playwright.async_api', 'async_playwright')().start()
+            self._idle = []
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self.launches += 1
+            return self._browser
+
+    async def _checkout(self):
+        browser = await self._ensure_browser()
+        while self._idle:
+            context, page, uses = self._idle.pop()
+            if not page.is_closed():
+                return context, page, uses
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.emulate_media(media='print')
+        return context, page, 0
+
+    async def _discard(self, context):
+        self.recycles += 1
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def render(self, html_string):
+        if optional_import('playwright.async_api', 'async_playwright') is None:
+            raise RuntimeError('Playwright not available')
+        self.loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            self._in_use += 1
+            try:
+                try:
+                    context, page, uses = await self._checkout()
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = str(e)
+                    raise
+                try:
+                    await asyncio.wait_for(page.set_content(html_string, wait_until='load'), self.render_timeout)
+                    pdf_bytes = await asyncio.wait_for(page.pdf(**PDF_OPTIONS), self.render_timeout)
+                except BaseException as e:
+                    self.errors += 1
+                    self.last_error = str(e) or type(e).__name__
+                    await self._discard(context)
+                    raise
+                uses += 1
+                self.renders += 1
+                if uses >= self.max_uses:
+                    await self._discard(context)
+                else:
+                    self._idle.append((context, page, uses))
+                return pdf_bytes
+            finally:
+                self._in_use -= 1
+
+    def health(self):
+        return {
+            'available': module_installed('playwright'),
+            'started': self._browser is not None,
+            'connected': bool(self._browser is not None and self._browser.is_connected()),
+            'concurrency': self.concurrency,
+            'in_use': self._in_use,
+            'idle_pages': len(self._idle),
+            'max_uses': self.max_uses,
+            'renders': self.renders,
+            'errors': self.errors,
+            'launches': self.launches,
+            'recycles': self.recycles,
+            'last_error': self.last_error,
+        }
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for context, _, _ in idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def kill(self):
+        # For a renderer whose loop has already finished, where nothing can be
+        # awaited any more: stop the Playwright driver process. The browser it
+        # launched talks to it over a pipe and exits when that pipe closes.
+        self._idle = []
+        self._browser = None
+        playwright, self._playwright = self._playwright, None
+        impl = getattr(playwright, '_impl_obj', None)
+        proc = getattr(getattr(getattr(impl, '_connection', None), '_transport', None), '_proc', None)
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            os.kill(proc.pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+
+_ASYNC_RENDERER = None
+
+
+def _retire(renderer):
+    # Close a renderer on its own loop while that loop still runs; once it has
+    # finished, kill the driver so its browser does not outlive it.
+    loop = renderer.loop
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(renderer.close(), loop)
+    else:
+        renderer.kill()
+
+
+def get_async_renderer():
+    # Playwright's async objects belong to the loop that created them, so a
+    # renderer left over from another loop is shut down and replaced.
+    global _ASYNC_RENDERER
+    loop = asyncio.get_running_loop()
+    if _ASYNC_RENDERER is None or (_ASYNC_RENDERER.loop is not None and _ASYNC_RENDERER.loop is not loop):
+        if _ASYNC_RENDERER is not None:
+            _retire(_ASYNC_RENDERER)
+        _ASYNC_RENDERER = AsyncPlaywrightRenderer()
+    return _ASYNC_RENDERER
+
+
+def async_renderer_health():
+    if _ASYNC_RENDERER is None:
+        return {'available': module_installed('playwright'), 'started': False}
+    return _ASYNC_RENDERER.health()
+
+
+async def shutdown_async_renderer():
+    global _ASYNC_RENDERER
+    renderer, _ASYNC_RENDERER = _ASYNC_RENDERER, None
+    if renderer is not None:
+        await renderer.close()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from resume_model import content_hash
+
+
+def _env_int(name, default):
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def template_fingerprint(templates_dir, template_name):
+    path = Path(templates_dir) / template_name
+    try:
+        st = path.stat()
+    except OSError:
+        return 'missing'
+    return f'{st.st_mtime_ns}:{st.st_size}'
+
+
+def cache_key(kind, data, templates_dir, template_name):
+    # parsed resumes carry a precomputed content hash, so this costs no serialisation
+    h = hashlib.sha256()
+    for part in (kind, template_name, template_fingerprint(templates_dir, template_name), content_hash(data)):
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+# Cache tier shared by all server worker processes on one machine. SQLite in
+# WAL mode handles the cross-process locking; each thread has its own
+# connection because sqlite3 connections are not shareable across threads.
+class SqliteStore:
+
+    def __init__(self, path, max_bytes=None):
+        self.path = str(path)
+        self.max_bytes = _env_int('RESUME_SHARED_CACHE_MAX_BYTES', 512 * 1024 * 1024) if max_bytes is None else max_bytes
+        self._local = threading.local()
+        self._puts = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_created ON entries (created)')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._conn().execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f'Shared render cache read failed: {e}')
+            return None
+        return bytes(row[0]) if row else None
+
+    def put(self, key, value):
+        try:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO entries (key, value, size, created) VALUES (?, ?, ?, ?)',
+                         (key, sqlite3.Binary(value), len(value), time.time()))
+            self._puts += 1
+            if self._puts % 32 == 0:
+                self._trim(conn)
+        except sqlite3.Error as e:
+            print(f'Shared render cache write failed: {e}')
+
+    def _trim(self, conn):
+        # oldest entries go first until the store is back under 90% of its limit
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY created'):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', doomed)
+
+    def stats(self):
+        try:
+            count, total = self._conn().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        except sqlite3.Error:
+            count = total = None
+        return {'path': self.path, 'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+
+
+class RenderCache:
+
+    def __init__(self, max_entries=None, max_bytes=None, disk_dir=None, shared_path=None, disk_max_bytes=None):
+        self.max_entries = _env_int('RESUME_CACHE_MAX_ENTRIES', 256) if max_entries is None else max_entries
+        self.max_bytes = _env_int('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024) if max_bytes is None else max_bytes
+        if disk_dir is None:
+            disk_dir = os.environ.get('RESUME_CACHE_DIR') or None
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = _env_int('RESUME_CACHE_DIR_MAX_BYTES', 512 * 1024 * 1024) if disk_max_bytes is None else disk_max_bytes
+        self._disk_puts = 0
+        self._disk_lock = threading.Lock()
+        if shared_path is None:
+            shared_path = os.environ.get('RESUME_SHARED_CACHE') or None
+        self.shared = SqliteStore(shared_path) if shared_path else None
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _memory_get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def get(self, key, shared=True):
+        # shared=False keeps small, cheap-to-rebuild entries (preview HTML)
+        # out of the SQLite tier
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        if shared and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                    self._store(key, value)
+                return value
+        value = self._disk_get(key)
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, value, shared=True):
+        with self._lock:
+            self._store(key, value)
+        self._persist(key, value, shared)
+
+    def _persist(self, key, value, shared=True):
+        if shared and self.shared is not None:
+            self.shared.put(key, value)
+        self._disk_put(key, value)
+
+    # Event-loop variants: the SQLite and disk tiers block (SQLite may wait
+    # up to its busy timeout on another worker's write), so they run in a
+    # thread. Memory hits stay on the loop.
+    async def aget(self, key):
+        value = self._memory_get(key)
+        if value is not None or (self.shared is None and self.disk_dir is None):
+            if value is None:
+                with self._lock:
+                    self.misses += 1
+            return value
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key, value):
+        with self._lock:
+            self._store(key, value)
+        if self.shared is not None or self.disk_dir is not None:
+            await asyncio.to_thread(self._persist, key, value)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'disk_dir': str(self.disk_dir) if self.disk_dir else None,
+                'disk_max_bytes': self.disk_max_bytes if self.disk_dir else None,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'shared': self.shared.stats() if self.shared is not None else None,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _store(self, key, value):
+        if len(value) > self.max_bytes or self.max_entries == 0:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._items[key] = value
+        self._bytes += len(value)
+        while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._items.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return self.disk_dir / key[:2] / key
+
+    def _disk_get(self, key):
+        if self.disk_dir is None:
+            return None
+        try:
+            return self._disk_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _disk_put(self, key, value):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write-then-rename so readers never see a partial entry
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f'Render cache disk write failed: {e}')
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return
+        with self._disk_lock:
+            self._disk_puts += 1
+            # the first write also trims what earlier runs left behind
+            due = self._disk_puts % 32 == 1
+        if due:
+            self._disk_trim()
+
+    def _disk_trim(self):
+        # Like the shared tier: oldest files (by mtime) go first until the
+        # directory is back under 90% of its limit. Other processes may trim
+        # the same directory, so files that are already gone are skipped.
+        entries = []
+        total = 0
+        for path in self.disk_dir.glob('*/*'):
+            if path.name.startswith('.tmp-'):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.disk_max_bytes:
+            return
+        excess = total - int(self.disk_max_bytes * 0.9)
+        freed = 0
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            freed += size
+            if freed >= excess:
+                break
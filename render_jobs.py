@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return max(1, cast(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class JobsFull(Exception):
+    pass
+
+
+class RenderJob:
+    __slots__ = ('id', 'status', 'template', 'cache_key', 'html', 'pdf', 'error',
+                 'created', 'started', 'finished')
+
+    def __init__(self, html, template, cache_key):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.template = template
+        self.cache_key = cache_key
+        self.html = html
+        self.pdf = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @classmethod
+    def from_record(cls, record, pdf):
+        job = cls.__new__(cls)
+        for name in ('id', 'status', 'template', 'cache_key', 'error', 'created', 'started', 'finished'):
+            setattr(job, name, record.get(name))
+        job.html = None
+        job.pdf = pdf
+        return job
+
+    def record(self):
+        return {name: getattr(self, name) for name in
+                ('id', 'status', 'template', 'cache_key', 'error', 'created', 'started', 'finished')}
+
+    def to_dict(self, ttl):
+        def ms(a, b):
+            return None if a is None or b is None else round((b - a) * 1000, 1)
+
+        return {
+            'id': self.id,
+            'status': self.status,
+            'template': self.template,
+            'error': self.error,
+            'created_at': self.created,
+            'started_at': self.started,
+            'finished_at': self.finished,
+            'queued_ms': ms(self.created, self.started),
+            'render_ms': ms(self.started, self.finished),
+            'total_ms': ms(self.created, self.finished),
+            'size': len(self.pdf) if self.pdf is not None else None,
+            'expires_at': self.finished + ttl if self.finished is not None else None,
+        }
+
+
+# Job records shared by all server worker processes, kept in a table of the
+# shared render cache file. Polls may land on any worker; whichever one took
+# the job publishes its status (and the PDF once done) here.
+class SharedJobStore:
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn().execute('CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, record TEXT NOT NULL, pdf BLOB, expires REAL NOT NULL)')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def save(self, job, expires):
+        try:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO jobs (id, record, pdf, expires) VALUES (?, ?, ?, ?)',
+                         (job.id, json.dumps(job.record()), sqlite3.Binary(job.pdf) if job.pdf is not None else None, expires))
+            conn.execute('DELETE FROM jobs WHERE expires < ?', (time.time(),))
+        except sqlite3.Error as e:
+            print(f'Shared job store write failed: {e}')
+
+    def load(self, job_id):
+        try:
+            row = self._conn().execute('SELECT record, pdf FROM jobs WHERE id = ? AND expires >= ?', (job_id, time.time())).fetchone()
+        except sqlite3.Error as e:
+            print(f'Shared job store read failed: {e}')
+            return None
+        if row is None:
+            return None
+        return RenderJob.from_record(json.loads(row[0]), bytes(row[1]) if row[1] is not None else None)
+
+
+# Background PDF rendering for POST /api/jobs. A fixed number of worker tasks
+# drain an asyncio queue; finished artifacts are kept for `ttl` seconds and
+# then dropped on the next access.
+class JobManager:
+
+    def __init__(self, render, workers=None, ttl=None, max_pending=None, on_done=None, store=None):
+        self.render = render
+        self.on_done = on_done
+        self.store = store
+        self.workers = workers or _env_number('RESUME_JOB_WORKERS', 2)
+        self.ttl = ttl or _env_number('RESUME_JOB_TTL', 600.0, float)
+        self.max_pending = max_pending or _env_number('RESUME_JOB_MAX_PENDING', 100)
+        # written on the event loop, read by sync routes (health, metrics)
+        # from the threadpool
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._queue = None
+        self._tasks = []
+
+    def _ensure_workers(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(), name=f'render-job-{i}') for i in range(self.workers)]
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def pending(self):
+        with self._jobs_lock:
+            return sum(1 for j in self._jobs.values() if j.status in ('queued', 'running'))
+
+    async def _publish(self, job):
+        if self.store is not None:
+            # unfinished jobs get a full ttl too, in case this worker dies
+            expires = (job.finished or time.time()) + self.ttl
+            await asyncio.to_thread(self.store.save, job, expires)
+
+    async def submit(self, html, template, cache_key, pdf=None):
+        self.purge()
+        job = RenderJob(html, template, cache_key)
+        if pdf is not None:
+            # already rendered (cache hit): nothing to queue
+            job.pdf = pdf
+            job.html = None
+            job.status = 'done'
+            job.started = job.finished = job.created
+        else:
+            if self.pending() >= self.max_pending:
+                raise JobsFull('Too many pending render jobs')
+            self._ensure_workers()
+            self._queue.put_nowait(job)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        await self._publish(job)
+        return job
+
+    async def get(self, job_id):
+        # jobs owned by another worker come from the shared store, off the loop
+        self.purge()
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = await asyncio.to_thread(self.store.load, job_id)
+        return job
+
+    def purge(self):
+        cutoff = time.time() - self.ttl
+        with self._jobs_lock:
+            expired = [k for k, j in self._jobs.items() if j.finished is not None and j.finished < cutoff]
+            for k in expired:
+                del self._jobs[k]
+
+    def stats(self):
+        counts = {}
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {'workers': self.workers, 'ttl_s': self.ttl, 'max_pending': self.max_pending, 'jobs': counts}
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = 'running'
+            job.started = time.time()
+            await self._publish(job)
+            try:
+                job.pdf = await self.render(job.html)
+                job.status = 'done'
+            except asyncio.CancelledError:
+                job.status = 'failed'
+                job.error = 'Server shutting down'
+                job.finished = time.time()
+                if self.store is not None:
+                    self.store.save(job, job.finished + self.ttl)
+                raise
+            except Exception as e:
+                job.status = 'failed'
+                job.error = str(e)
+            job.finished = time.time()
+            job.html = None
+            if job.status == 'done' and self.on_done is not None:
+                await asyncio.to_thread(self.on_done, job)
+            await self._publish(job)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return max(0, cast(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class QueueRejected(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFull(QueueRejected):
+    pass
+
+
+class QueueTimeout(QueueRejected):
+    pass
+
+
+class ClientGone(Exception):
+    pass
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+# Admission control in front of the PDF renderers: at most max_in_flight jobs
+# run, at most max_queue wait behind them, and anything beyond that is turned
+# away at once so the caller can answer 429 instead of piling up work.
+class RenderQueue:
+
+    def __init__(self, max_in_flight=None, max_queue=None, deadline=None):
+        self.max_in_flight = max_in_flight or _env_number('RESUME_MAX_IN_FLIGHT', _env_number('RESUME_RENDER_CONCURRENCY', 4)) or 1
+        self.max_queue = _env_number('RESUME_MAX_QUEUE', 16) if max_queue is None else max_queue
+        self.deadline = deadline or _env_number('RESUME_QUEUE_DEADLINE', 30.0, float)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._waiting = 0
+        self._in_flight = 0
+        self._waits = deque(maxlen=1024)
+        self._service = deque(maxlen=1024)
+        self.admitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.cancelled = 0
+
+    def retry_after(self):
+        # rough time until a slot frees up, never less than a second
+        avg = (sum(self._service) / len(self._service)) if self._service else 1.0
+        backlog = self._waiting + self._in_flight
+        return max(1, math.ceil(avg * backlog / self.max_in_flight))
+
+    def _abandon(self, acquire):
+        # The permit may already have been handed over when the waiter gives
+        # up (e.g. cancelled between the release and its wake-up); cancelling
+        # a finished acquire does nothing, so the permit is given back instead.
+        if acquire.done() and not acquire.cancelled() and acquire.exception() is None:
+            self._semaphore.release()
+        else:
+            acquire.cancel()
+
+    async def submit(self, job, deadline=None, client_gone=None):
+        # job: zero-argument coroutine function. client_gone: optional
+        # coroutine function that returns once the requester has disconnected.
+        # The counters change synchronously, so a burst arriving within one
+        # loop tick is admitted against up-to-date numbers.
+        if self._waiting + self._in_flight >= self.max_in_flight + self.max_queue:
+            self.rejected += 1
+            raise QueueFull('Render queue is full', self.retry_after())
+
+        enqueued = time.perf_counter()
+        self._waiting += 1
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        gone = asyncio.ensure_future(client_gone()) if client_gone else None
+        try:
+            watched = {acquire} if gone is None else {acquire, gone}
+            done, _ = await asyncio.wait(watched, timeout=deadline or self.deadline, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            self._abandon(acquire)
+            raise
+        finally:
+            self._waiting -= 1
+            if gone is not None:
+                gone.cancel()
+
+        if acquire not in done:
+            self._abandon(acquire)
+            if gone is not None and gone in done:
+                self.cancelled += 1
+                raise ClientGone('Client disconnected while queued')
+            self.timed_out += 1
+            raise QueueTimeout('Timed out waiting for a render slot', self.retry_after())
+
+        self._waits.append(time.perf_counter() - enqueued)
+        self.admitted += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await job()
+        finally:
+            self._in_flight -= 1
+            self.completed += 1
+            self._service.append(time.perf_counter() - started)
+            self._semaphore.release()
+
+    def stats(self):
+        waits = list(self._waits)
+        service = list(self._service)
+
+        def ms(v):
+            return None if v is None else round(v * 1000, 1)
+
+        return {
+            'max_in_flight': self.max_in_flight,
+            'max_queue': self.max_queue,
+            'deadline_s': self.deadline,
+            'in_flight': self._in_flight,
+            'queued': self._waiting,
+            'admitted': self.admitted,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+            'cancelled': self.cancelled,
+            'wait_ms_p50': ms(_percentile(waits, 50)),
+            'wait_ms_p95': ms(_percentile(waits, 95)),
+            'wait_ms_max': ms(max(waits) if waits else None),
+            'service_ms_p50': ms(_percentile(service, 50)),
+            'service_ms_p95': ms(_percentile(service, 95)),
+        }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+
+from metrics import PDF_BACKEND_TOTAL
+
+RENDERERS = ('weasyprint', 'playwright', 'cdp')
+# values accepted by --renderer and RESUME_PDF_RENDERER
+RENDERER_CHOICES = ('auto',) + RENDERERS
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return max(1, cast(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def first_line(error):
+    # Playwright errors carry a multi-line install banner; the first line is
+    # enough. Takes an exception or a message; None stays None.
+    if error is None:
+        return None
+    return (str(error).strip().splitlines() or [''])[0]
+
+
+# Skips a backend after `threshold` consecutive failures. Once `cooldown`
+# seconds have passed a single trial call is let through (half-open); it
+# closes the breaker on success and re-opens it on failure.
+class CircuitBreaker:
+
+    def __init__(self, threshold=None, cooldown=None):
+        self.threshold = threshold or _env_number('RESUME_BREAKER_THRESHOLD', 3)
+        self.cooldown = cooldown or _env_number('RESUME_BREAKER_COOLDOWN', 30.0, float)
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.last_error = None
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return 'open'
+
+    def ready(self):
+        # like allow() but without claiming the half-open trial
+        state = self.state
+        return state == 'closed' or (state == 'half_open' and not self.trial)
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self.trial:
+                self.trial = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = first_line(error)
+            if self.trial or self.failures >= self.threshold:
+                self._open()
+
+    def release(self):
+        # The call ended without a verdict (e.g. it was cancelled): give the
+        # half-open trial back so the next call can take it.
+        with self._lock:
+            self.trial = False
+
+    def trip(self, error=None):
+        with self._lock:
+            self.last_error = first_line(error)
+            self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self.trial = False
+        self.trips += 1
+
+    def retry_in(self):
+        if self.opened_at is None:
+            return 0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'retry_in_s': round(self.retry_in(), 1),
+            'last_error': self.last_error,
+        }
+
+
+# Decides which PDF backends a render may use. Capabilities come from
+# `probe(browser_path)` -> {name: None if usable else reason}, run once per
+# browser path and cached; RESUME_PDF_RENDERER (or set_choice) pins a single
+# backend instead of the weasyprint -> playwright -> cdp fallback chain.
+class RendererSelector:
+
+    def __init__(self, probe, choice=None):
+        self._probe = probe
+        self.choice = self._validate(choice or os.environ.get('RESUME_PDF_RENDERER') or 'auto')
+        self.breakers = {name: CircuitBreaker() for name in RENDERERS}
+        self._capabilities = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _validate(choice):
+        choice = choice.strip().lower()
+        if choice not in RENDERER_CHOICES:
+            raise ValueError(f"Unknown PDF renderer {choice!r}; expected 'auto' or one of {', '.join(RENDERERS)}")
+        return choice
+
+    def set_choice(self, choice):
+        self.choice = self._validate(choice)
+
+    def probed(self, browser_path=None):
+        return browser_path in self._capabilities
+
+    def capabilities(self, browser_path=None):
+        caps = self._capabilities.get(browser_path)
+        if caps is None:
+            with self._lock:
+                caps = self._capabilities.get(browser_path)
+                if caps is None:
+                    caps = self._capabilities[browser_path] = self._probe(browser_path)
+        return caps
+
+    def reprobe(self):
+        with self._lock:
+            self._capabilities.clear()
+
+    def candidates(self, browser_path=None, choice=None):
+        choice = self._validate(choice) if choice else self.choice
+        caps = self.capabilities(browser_path)
+        if choice != 'auto':
+            if caps.get(choice):
+                raise RuntimeError(f'PDF renderer {choice} is not available: {caps[choice]}')
+            breaker = self.breakers[choice]
+            if not breaker.ready():
+                PDF_BACKEND_TOTAL.inc(backend=choice, result='skipped')
+                raise RuntimeError(f'PDF renderer {choice} is cooling down after failures '
+                                   f'(retry in {breaker.retry_in():.0f}s): {breaker.last_error}')
+            return [choice]
+
+        usable = [name for name in RENDERERS if not caps.get(name)]
+        if not usable:
+            raise RuntimeError('No PDF renderer available (WeasyPrint missing and no Chrome/Edge found). Use --html-only.')
+        allowed = []
+        for name in usable:
+            if self.breakers[name].ready():
+                allowed.append(name)
+            else:
+                PDF_BACKEND_TOTAL.inc(backend=name, result='skipped')
+        if not allowed:
+            soonest = min(self.breakers[n].retry_in() for n in usable)
+            raise RuntimeError(f'All PDF renderers are cooling down after failures (retry in {soonest:.0f}s)')
+        return allowed
+
+    def begin(self, name):
+        # Called right before trying a backend; False means another request
+        # has since opened the breaker or taken the half-open trial.
+        if self.breakers[name].allow():
+            return True
+        PDF_BACKEND_TOTAL.inc(backend=name, result='skipped')
+        return False
+
+    def record(self, name, ok, error=None):
+        breaker = self.breakers[name]
+        if ok:
+            breaker.success()
+        else:
+            breaker.failure(error)
+
+    def abandon(self, name):
+        # for an attempt that was interrupted rather than failed
+        self.breakers[name].release()
+
+    def stats(self):
+        return {
+            'choice': self.choice,
+            'capabilities': {k or 'default': v for k, v in self._capabilities.items()},
+            'breakers': {name: b.stats() for name, b in self.breakers.items()},
+        }
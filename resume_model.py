@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import sys
+
+# Parsed resumes are read-only dict subclasses: templates keep using
+# data['work experience'] / job.get('experience'), json.dumps works unchanged,
+# and the content hash used for cache keys is computed once per resume.
+# Lists are stored as tuples and job/education entries as read-only dicts, so
+# nothing can change under a hash that has already been handed out.
+
+SCALAR_FIELDS = ('name', 'address', 'email', 'telegram_address')
+TEXT_LIST_FIELDS = ('about me', 'skills', 'cover letter')
+ENTRY_FIELDS = {
+    'work experience': ('company name', 'role', 'period', 'experience'),
+    'education': ('institution', 'period', 'degree'),
+}
+# entry fields short and repetitive enough to be worth interning
+_INTERNED = frozenset(('company name', 'role', 'period', 'institution', 'degree'))
+
+
+def canonical_json(value):
+    # sort_keys makes the output independent of dict insertion order
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _field_digest(value):
+    return hashlib.blake2b(canonical_json(value).encode('utf-8'), digest_size=16).digest()
+
+
+def _combine(digests):
+    h = hashlib.blake2b(digest_size=16)
+    for key in sorted(digests):
+        h.update(key.encode('utf-8'))
+        h.update(b'\0')
+        h.update(digests[key])
+    return sys.intern(h.hexdigest())
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} is read-only; use Resume.replace() to change fields')
+
+
+def _freeze(value):
+    if isinstance(value, Entry):
+        return value
+    if isinstance(value, dict):
+        return Entry(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Entry(dict):
+    __slots__ = ()
+
+    def __init__(self, fields=()):
+        super().__init__()
+        for key, value in dict(fields).items():
+            if isinstance(value, str) and key in _INTERNED:
+                value = sys.intern(value)
+            dict.__setitem__(self, key, _freeze(value))
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class Resume(dict):
+    __slots__ = ('content_hash', '_digests')
+
+    def __init__(self, fields=(), _digests=None):
+        super().__init__()
+        digests = {}
+        for key, value in dict(fields).items():
+            value = _freeze(value)
+            dict.__setitem__(self, key, value)
+            known = _digests.get(key) if _digests else None
+            digests[key] = known if known is not None else _field_digest(value)
+        self._digests = digests
+        self.content_hash = _combine(digests)
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self):
+        return hash(self.content_hash)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    @classmethod
+    def from_dict(cls, data):
+        # For resumes loaded from JSON files; parser output is already well formed
+        if isinstance(data, cls):
+            return data
+        validate(data)
+        return cls(data)
+
+    def replace(self, changes):
+        # New resume with some fields changed; the other fields keep their digests
+        kept = {k: d for k, d in self._digests.items() if k not in changes}
+        return type(self)({**self, **changes}, _digests=kept)
+
+    def subset(self, keys):
+        return type(self)({k: self[k] for k in keys if k in self}, _digests=self._digests)
+
+    def without(self, *keys):
+        return type(self)({k: v for k, v in self.items() if k not in keys}, _digests=self._digests)
+
+    def to_json(self):
+        return canonical_json(self)
+
+
+def content_hash(data):
+    # Resumes carry their hash; plain dicts (e.g. loaded JSON) are hashed the
+    # same way so both produce the same cache keys.
+    if isinstance(data, Resume):
+        return data.content_hash
+    return _combine({key: _field_digest(value) for key, value in data.items()})
+
+
+def _check_text(value, path):
+    if not isinstance(value, str):
+        raise ValueError(f'{path}: expected a string, got {type(value).__name__}')
+
+
+def _check_text_list(value, path):
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f'{path}: expected a list, got {type(value).__name__}')
+    for i, item in enumerate(value):
+        _check_text(item, f'{path}[{i}]')
+
+
+def validate(data):
+    # Checks the fields templates rely on; unknown keys are left alone so
+    # custom templates can use their own.
+    if not isinstance(data, dict):
+        raise ValueError(f'resume: expected an object, got {type(data).__name__}')
+    for key in SCALAR_FIELDS:
+        if key in data:
+            _check_text(data[key], key)
+    for key in TEXT_LIST_FIELDS:
+        if key in data:
+            _check_text_list(data[key], key)
+    for key, fields in ENTRY_FIELDS.items():
+        if key not in data:
+            continue
+        entries = data[key]
+        if not isinstance(entries, (list, tuple)):
+            raise ValueError(f'{key}: expected a list, got {type(entries).__name__}')
+        for i, entry in enumerate(entries):
+            path = f'{key}[{i}]'
+            if not isinstance(entry, dict):
+                raise ValueError(f'{path}: expected an object, got {type(entry).__name__}')
+            for field in fields:
+                if field not in entry:
+                    continue
+                if field == 'experience':
+                    _check_text_list(entry[field], f'{path}.{field}')
+                else:
+                    _check_text(entry[field], f'{path}.{field}')
+    return data
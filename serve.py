@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import sys
+import tempfile
+
+from renderer_select import RENDERER_CHOICES
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+# Multi-process serving: uvicorn forks `workers` copies of api_server, each
+# with its own event loop, browser and WeasyPrint threads. Settings are passed
+# to the workers through the environment, which they inherit.
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run api_server with several worker processes')
+    parser.add_argument('--host', default=os.environ.get('RESUME_HOST', '127.0.0.1'), help='Bind address')
+    parser.add_argument('--port', type=int, default=_env_int('RESUME_PORT', 8000), help='Bind port')
+    parser.add_argument('--workers', '-w', type=int, default=_env_int('RESUME_WORKERS', os.cpu_count() or 1),
+                        help='Worker processes (default: RESUME_WORKERS or CPU count)')
+    parser.add_argument('--pool-size', type=int, default=_env_int('RESUME_RENDER_CONCURRENCY', 2),
+                        help='Concurrent PDF renders per worker (default: RESUME_RENDER_CONCURRENCY or 2)')
+    parser.add_argument('--shared-cache', default=os.environ.get('RESUME_SHARED_CACHE') or os.path.join(tempfile.gettempdir(), 'resume-render-cache.sqlite'),
+                        help='SQLite file for the render cache shared by all workers; "" to disable')
+    parser.add_argument('--renderer', choices=RENDERER_CHOICES, help='PDF backend for every worker')
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print('uvicorn is not installed: pip install -r requirements.txt', file=sys.stderr)
+        return 1
+
+    pool = str(max(1, args.pool_size))
+    os.environ['RESUME_RENDER_CONCURRENCY'] = pool
+    os.environ['RESUME_PDF_POOL_SIZE'] = pool
+    os.environ['RESUME_WEASYPRINT_WORKERS'] = pool
+    os.environ['RESUME_WORKER_TMP'] = '1'
+    # compiled templates stay shared; only renderer scratch files are per worker
+    os.environ.setdefault('RESUME_JINJA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'resume-jinja-cache'))
+    if args.shared_cache:
+        os.environ['RESUME_SHARED_CACHE'] = args.shared_cache
+    else:
+        os.environ.pop('RESUME_SHARED_CACHE', None)
+    if args.renderer:
+        os.environ['RESUME_PDF_RENDERER'] = args.renderer
+    if args.workers > 1 and not args.shared_cache:
+        print('Warning: without --shared-cache, background jobs are only visible to the worker '
+              'that accepted them; polls routed to other workers answer 404', file=sys.stderr)
+
+    print(f'Serving on http://{args.host}:{args.port} with {args.workers} workers, '
+          f'{pool} renders each, shared cache: {args.shared_cache or "off"}')
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    uvicorn.run('api_server:app', host=args.host, port=args.port, workers=max(1, args.workers), app_dir=base_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import argparse
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from generate_resume import html_to_pdf_bytes, load_resume, render_html, set_renderer
+from parse_input_text import parse_text
+from renderer_select import RENDERER_CHOICES
+
+
+def output_name(template_name, fmt):
+    return f'{Path(template_name).stem}.{fmt}'
+
+
+def build_zip(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for name, content in files.items():
+            # PDFs are already compressed; deflating them again only costs CPU
+            method = zipfile.ZIP_STORED if name.endswith('.pdf') else zipfile.ZIP_DEFLATED
+            zf.writestr(name, content, compress_type=method)
+    return buf.getvalue()
+
+
+def render_many(data, template_names, templates_dir, fmt='html', browser_path=None, max_workers=None):
+    # HTML rendering is cheap and done inline; the PDF step runs in parallel
+    # so the total is close to the slowest single template.
+    htmls = {t: render_html(data, templates_dir, t) for t in template_names}
+    if fmt == 'html':
+        return {output_name(t, 'html'): h.encode('utf-8') for t, h in htmls.items()}
+
+    base_url = os.path.abspath(templates_dir)
+    workers = max_workers or len(template_names) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {t: pool.submit(html_to_pdf_bytes, h, base_url=base_url, browser_path=browser_path) for t, h in htmls.items()}
+        return {output_name(t, 'pdf'): f.result() for t, f in futures.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render one resume with several templates into a ZIP archive')
+    parser.add_argument('input', help='Resume as plain text (parsed like parse_input_text.py) or a JSON file')
+    parser.add_argument('--template', action='append', help='Template file name; repeat for each template (default: all)')
+    parser.add_argument('--templates', '-t', default='templates', help='Templates directory')
+    parser.add_argument('--format', choices=['html', 'pdf'], default='pdf', help='Output format inside the archive')
+    parser.add_argument('--output', '-o', default='templates_compare.zip', help='Output ZIP path')
+    parser.add_argument('--browser', '-b', help='Path to Chrome/Edge executable to use as fallback renderer')
+    parser.add_argument('--renderer', choices=RENDERER_CHOICES, help='PDF backend to use (default: RESUME_PDF_RENDERER or auto)')
+    args = parser.parse_args()
+    if args.renderer:
+        set_renderer(args.renderer)
+
+    if args.input.lower().endswith('.json'):
+        data = load_resume(args.input)
+    else:
+        data = parse_text(Path(args.input).read_text(encoding='utf-8-sig'))
+
+    templates = args.template or sorted(p.name for p in Path(args.templates).glob('*.html'))
+    start = time.perf_counter()
+    files = render_many(data, templates, args.templates, fmt=args.format, browser_path=args.browser)
+    Path(args.output).write_bytes(build_zip(files))
+    print(f'Rendered {len(files)} templates in {time.perf_counter() - start:.2f}s: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+
+from generate_resume import render_html
+from render_cache import template_fingerprint
+from resume_model import Resume
+
+
+def thumbnails_enabled():
+    return os.environ.get('RESUME_GALLERY_THUMBNAILS', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _file_stamp(path):
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Sample renders for the template gallery. The sample resume is read once and
+# every template is rendered at most once per (template, sample) version, so
+# browsing the gallery costs a dict lookup per view. PDFs are rendered with
+# `render` (coroutine function html -> PDF bytes), the server's own renderer.
+class TemplateGallery:
+
+    def __init__(self, templates_dir, sample_path, render=None):
+        self.templates_dir = str(templates_dir)
+        self.sample_path = Path(sample_path)
+        self.render = render
+        self._sample = None
+        self._sample_stamp = None
+        self._html = {}
+        self._pdf = {}
+        self._lock = threading.Lock()
+
+    def sample(self):
+        stamp = _file_stamp(self.sample_path)
+        if stamp is None:
+            raise FileNotFoundError(str(self.sample_path))
+        with self._lock:
+            if stamp != self._sample_stamp:
+                self._sample = Resume.from_dict(json.loads(self.sample_path.read_text(encoding='utf-8-sig')))
+                self._sample_stamp = stamp
+                self._html.clear()
+                self._pdf.clear()
+            return self._sample
+
+    def version(self, template_name):
+        # changes whenever the template or the sample data changes; used as ETag
+        stamp = self._sample_stamp or (0, 0)
+        return f'{template_fingerprint(self.templates_dir, template_name)}-{stamp[0]}:{stamp[1]}'
+
+    def _cached(self, cache, template_name, version):
+        with self._lock:
+            entry = cache.get(template_name)
+        return entry[1] if entry is not None and entry[0] == version else None
+
+    def _store(self, cache, template_name, version, value):
+        with self._lock:
+            cache[template_name] = (version, value)
+
+    def html(self, template_name):
+        data = self.sample()
+        version = self.version(template_name)
+        html = self._cached(self._html, template_name, version)
+        if html is None:
+            html = render_html(data, self.templates_dir, template_name=template_name)
+            self._store(self._html, template_name, version, html)
+        return html, version
+
+    def pdf(self, template_name):
+        # (PDF or None, version); the PDF is None until render_pdf has
+        # produced it for the current version
+        self.sample()
+        version = self.version(template_name)
+        return self._cached(self._pdf, template_name, version), version
+
+    async def render_pdf(self, template_name):
+        html, version = await asyncio.to_thread(self.html, template_name)
+        pdf = await self.render(html)
+        self._store(self._pdf, template_name, version, pdf)
+        return pdf
+
+    def warm(self, template_names):
+        for name in template_names:
+            self.html(name)
+
+    async def warm_thumbnails(self, template_names):
+        for name in template_names:
+            try:
+                await self.render_pdf(name)
+            except Exception as e:
+                print(f'Gallery preview for {name} failed: {e}')
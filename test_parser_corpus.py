@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+
+from parser_corpus import BASELINE_PATH, SEED, _load_baseline, check_goldens, check_throughput, fuzz, measure
+
+# The same gate as `python parser_corpus.py check`, as part of the test run.
+
+
+def test_goldens():
+    assert check_goldens() == []
+
+
+def test_fuzz():
+    assert fuzz(300, seed=SEED) == []
+
+
+def test_throughput():
+    baseline = _load_baseline(os.environ.get('RESUME_PARSER_BASELINE') or BASELINE_PATH)
+    tolerance = float(os.environ.get('RESUME_PARSER_TOLERANCE', 0.25))
+    assert check_throughput(measure(repeat=3), baseline, tolerance, max_slowdown=2.0) == []
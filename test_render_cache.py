@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from render_cache import RenderCache
+
+
+def test_disk_tier_drops_oldest_files(tmp_path):
+    # memory tier off so every read goes to disk; trims run every 32 writes
+    cache = RenderCache(max_entries=0, disk_dir=tmp_path, shared_path='', disk_max_bytes=10_000)
+    keys = [f'{i:064x}' for i in range(100)]
+    for key in keys:
+        cache.put(key, b'x' * 1000)
+    assert sum(p.stat().st_size for p in tmp_path.glob('*/*')) <= 10_000 + 32 * 1000
+    assert cache.get(keys[-1]) is not None
+    assert cache.get(keys[0]) is None
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from render_queue import RenderQueue
+
+
+async def _cancel_during_handover(ticks):
+    # One slot: a holder finishes while a second submit waits for the slot,
+    # and the waiter is cancelled `ticks` loop iterations after the release,
+    # i.e. possibly after the permit was handed to it but before it resumed.
+    queue = RenderQueue(max_in_flight=1, max_queue=4, deadline=5)
+    release = asyncio.Event()
+
+    async def hold():
+        await release.wait()
+
+    async def noop():
+        return 'ok'
+
+    holder = asyncio.create_task(queue.submit(hold))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(queue.submit(noop))
+    await asyncio.sleep(0)
+    release.set()
+    for _ in range(ticks):
+        await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+
+    assert queue.stats()['in_flight'] == 0
+    assert queue.stats()['queued'] == 0
+    # the slot must still be usable
+    assert await queue.submit(noop, deadline=0.5) == 'ok'
+
+
+@pytest.mark.parametrize('ticks', range(6))
+def test_cancel_while_permit_is_handed_over(ticks):
+    asyncio.run(_cancel_during_handover(ticks))
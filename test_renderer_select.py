@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+import generate_resume
+from renderer_select import CircuitBreaker, RendererSelector
+
+
+def _half_open():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.001)
+    breaker.trip('boom')
+    while breaker.state != 'half_open':
+        pass
+    return breaker
+
+
+def test_released_trial_can_be_taken_again():
+    breaker = _half_open()
+    assert breaker.allow()
+    assert not breaker.ready()
+    breaker.release()
+    assert breaker.ready()
+    assert breaker.allow()
+
+
+def test_cancelled_trial_render_releases_breaker(monkeypatch):
+    selector = RendererSelector(lambda browser_path: {'weasyprint': None, 'playwright': 'x', 'cdp': 'x'})
+    selector.breakers['weasyprint'] = _half_open()
+    monkeypatch.setattr(generate_resume, 'RENDERERS', selector)
+
+    async def hang(*args):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(generate_resume, '_render_async', hang)
+
+    async def main():
+        task = asyncio.create_task(generate_resume.html_to_pdf_bytes_async('<p>x</p>'))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert selector.breakers['weasyprint'].ready()
+    assert selector.candidates() == ['weasyprint']
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+import pytest
+
+from generate_resume import _stylesheet_liftable, _weasyprint_document, load_resume, render_html
+from lazy_imports import optional_import
+
+# The cached WeasyPrint path lifts a template's <style> block into a reused,
+# pre-parsed stylesheet. It must lay documents out exactly like the plain path.
+
+BASE_DIR = Path(__file__).resolve().parent
+TEMPLATES_DIR = BASE_DIR / 'templates'
+TEMPLATES = sorted(p.name for p in TEMPLATES_DIR.glob('*.html'))
+
+needs_weasyprint = pytest.mark.skipif(optional_import('weasyprint', 'HTML') is None,
+                                      reason='WeasyPrint or its native libraries are not installed')
+
+
+def _num(value):
+    return round(value, 2) if isinstance(value, (int, float)) else value
+
+
+def _layout(document):
+    # Every box on every page with its geometry, colour, font and text
+    out = []
+    for page in document.pages:
+        out.append(('page', _num(page.width), _num(page.height)))
+        stack = [page._page_box]
+        while stack:
+            box = stack.pop()
+            out.append((
+                type(box).__name__,
+                _num(getattr(box, 'position_x', None)), _num(getattr(box, 'position_y', None)),
+                _num(getattr(box, 'width', None)), _num(getattr(box, 'height', None)),
+                str(box.style['color']), str(box.style['background_color']), _num(box.style['font_size']),
+                getattr(box, 'text', None),
+            ))
+            stack.extend(reversed(list(box.all_children())))
+    return out
+
+
+def _assert_same_layout(html):
+    cold = _layout(_weasyprint_document(html, str(TEMPLATES_DIR), cached=False))
+    # twice, so the second render uses the stylesheet parsed by the first
+    _weasyprint_document(html, str(TEMPLATES_DIR), cached=True)
+    warm = _layout(_weasyprint_document(html, str(TEMPLATES_DIR), cached=True))
+    assert warm == cold
+
+
+@needs_weasyprint
+@pytest.mark.parametrize('template', TEMPLATES)
+def test_cached_matches_uncached(template):
+    data = load_resume(BASE_DIR / 'sample_input.json')
+    _assert_same_layout(render_html(data, str(TEMPLATES_DIR), template))
+
+
+@needs_weasyprint
+@pytest.mark.parametrize('html', [
+    '<html><head><style>p { color: red !important }</style></head><body><p style="color: blue">x</p></body></html>',
+    '<html><head><style>p { color: red }</style><style media="print">p { color: green }</style></head><body><p>x</p></body></html>',
+])
+def test_cached_matches_uncached_origin_sensitive(html):
+    _assert_same_layout(html)
+
+
+@pytest.mark.parametrize('css, rest, liftable', [
+    ('p { color: red }', '<p>x</p>', True),
+    ('p { color: red !important }', '<p>x</p>', False),
+    ('@import url(x.css); p { color: red }', '<p>x</p>', False),
+    ('p { color: red }', '<link rel="stylesheet" href="x.css"><p>x</p>', False),
+    ('p { color: red }', '<style media="print">p { color: green }</style>', False),
+])
+def test_stylesheet_liftable(css, rest, liftable):
+    assert _stylesheet_liftable(css, rest) is liftable